@@ -1,12 +1,36 @@
+import time
+_PROCESS_START = time.perf_counter()          # for the cold start measurement
+
+import os
 import sys
+import re
+import sqlite3
+import multiprocessing
 import colorsys
+import functools
+import html
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
 from PySide6.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout,
     QHBoxLayout, QSlider, QTabWidget, QFormLayout, QColorDialog, QToolButton,
-    QGroupBox, QFileDialog, QMessageBox
+    QGroupBox, QFileDialog, QMessageBox, QSpinBox, QCheckBox, QTableView,
+    QComboBox, QHeaderView, QAbstractItemView, QMenu, QFrame, QGridLayout,
+    QTableWidget, QTableWidgetItem, QRubberBand, QGraphicsView, QGraphicsScene,
+    QGraphicsItem, QStyleOptionGraphicsItem
+)
+from PySide6.QtCore import (
+    Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QObject, Signal,
+    QTimer, QStandardPaths, QByteArray, QBuffer, QIODevice, QRect,
+    QRectF, QSizeF, QSize, QUrl, QThreadPool, QFile, QFileDevice
+)
+from PySide6.QtGui import (
+    QFont, QPalette, QColor, QPixmap, QImage, QPainter, QIcon, QGuiApplication,
+    QPixmapCache, QTransform
 )
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont, QPalette, QColor, QPixmap
 
 ################################################################################
 # Light / Dark stylesheets / Algo bien
@@ -21,12 +45,6 @@ QToolButton {
 QToolButton:hover {
     background-color: #f0f0f0;
 }
-QToolTip {
-    color: #333;
-    background-color: #fafafa;
-    border: 1px solid #999;
-    padding: 4px;
-}
 QLineEdit {
     background-color: #fff;
     color: #333;
@@ -74,12 +92,6 @@ QToolButton {
 QToolButton:hover {
     background-color: #666;
 }
-QToolTip {
-    color: #ddd;
-    background-color: #2f2f2f;
-    border: 1px solid #666;
-    padding: 4px;
-}
 QLineEdit {
     background-color: #3a3a3a;
     color: #ddd;
@@ -117,6 +129,52 @@ QTabBar::tab:selected {
 }
 """
 
+TOOLTIP_STYLESHEET = """
+QToolTip {
+    color: palette(tooltip-text);
+    background-color: palette(tooltip-base);
+    border: 1px solid palette(mid);
+    padding: 4px;
+}
+"""
+# tooltips are top level windows so they only see the app stylesheet, their colors come from the palette
+
+@functools.lru_cache(maxsize=None)
+def prebuilt_theme(dark):              #built once, switching theme only swaps these
+    palette = QPalette()
+    if dark:
+        palette.setColor(QPalette.Window, QColor(45, 45, 45))
+        palette.setColor(QPalette.WindowText, Qt.white)
+        palette.setColor(QPalette.Base, QColor(30, 30, 30))
+        palette.setColor(QPalette.AlternateBase, QColor(45, 45, 45))
+        palette.setColor(QPalette.ToolTipBase, QColor(47, 47, 47))
+        palette.setColor(QPalette.ToolTipText, QColor(221, 221, 221))
+        palette.setColor(QPalette.Text, Qt.white)
+        palette.setColor(QPalette.Button, QColor(45, 45, 45))
+        palette.setColor(QPalette.ButtonText, Qt.white)
+        palette.setColor(QPalette.BrightText, Qt.red)
+        palette.setColor(QPalette.Mid, QColor(102, 102, 102))
+        palette.setColor(QPalette.Link, QColor(42, 130, 218))
+        palette.setColor(QPalette.Highlight, QColor(90, 150, 240))
+        palette.setColor(QPalette.HighlightedText, Qt.black)
+        return palette, DARK_STYLESHEET
+
+    palette.setColor(QPalette.Window, QColor(240, 240, 240))
+    palette.setColor(QPalette.WindowText, Qt.black)
+    palette.setColor(QPalette.Base, Qt.white)
+    palette.setColor(QPalette.AlternateBase, QColor(225, 225, 225))
+    palette.setColor(QPalette.ToolTipBase, QColor(250, 250, 250))
+    palette.setColor(QPalette.ToolTipText, QColor(51, 51, 51))
+    palette.setColor(QPalette.Text, Qt.black)
+    palette.setColor(QPalette.Button, QColor(240, 240, 240))
+    palette.setColor(QPalette.ButtonText, Qt.black)
+    palette.setColor(QPalette.BrightText, Qt.red)
+    palette.setColor(QPalette.Mid, QColor(153, 153, 153))
+    palette.setColor(QPalette.Link, QColor(0, 120, 215))
+    palette.setColor(QPalette.Highlight, QColor(0, 120, 215))
+    palette.setColor(QPalette.HighlightedText, Qt.white)
+    return palette, LIGHT_STYLESHEET
+
 ###################################################################
 # Contrast calculation / Formulas for the WCAG standarts  
 
@@ -148,6 +206,16 @@ def contrast_ratio(hex_fg, hex_bg):
 
     return (L1 + 0.05) / (L2 + 0.05)
 
+@functools.lru_cache(maxsize=65536)
+def hex_luminance(hex_color):        # cached luminance per hex, so big worksheets dont redo the math
+    r, g, b, _ = hex_to_rgba(hex_color[:7])
+    return relative_luminance(r, g, b)
+
+def ratio_from_luminance(L1, L2):     # same as the end of contrast_ratio()
+    if L2 > L1:
+        L1, L2 = L2, L1
+    return (L1 + 0.05) / (L2 + 0.05)
+
 def check_conformance(ratio):
     return {
         "AA (Normal Text)": "Pass" if ratio >= 4.5 else "Fail",
@@ -188,6 +256,12 @@ def hsv_to_hex(h, s, v, a=1.0):
     r, g, b = colorsys.hsv_to_rgb(h, s, v)
     return rgb_to_hex(r, g, b, a)
 
+def hex_with_alpha(hex_color, a):    # same rgb, new alpha, formatted like rgb_to_hex()
+    a_i = max(0, min(int(a*255), 255))
+    if a_i >= 255:
+        return hex_color[:7]
+    return f"{hex_color[:7]}{a_i:02X}"
+
 def hex_to_rgba_str(hex_color):    #setting a color or a bg in CSS
     
     hex_color = hex_color.strip('#')
@@ -199,21 +273,1877 @@ def hex_to_rgba_str(hex_color):    #setting a color or a bg in CSS
         a = int(hex_color[6:8], 16)
     return f"rgba({r},{g},{b},{a/255:.2f})"
 
+_HEX_RE = re.compile(r"^#?([0-9A-Fa-f]{6}|[0-9A-Fa-f]{8})$")
+
+def normalize_hex(text):             # "  abc123 " -> "#ABC123", anything else is an error
+    text = text.strip()
+    if not _HEX_RE.match(text):
+        raise ValueError(f"Invalid hex color: {text!r}")
+    return "#" + text.lstrip('#').upper()
+
+def hex_to_rgba(hex_color):          # "#RRGGBB" or "#RRGGBBAA" -> floats 0..1
+    hex_color = hex_color.strip('#')
+    if len(hex_color) < 6:
+        raise ValueError("Invalid hex color.")
+    r = int(hex_color[0:2], 16)/255.0
+    g = int(hex_color[2:4], 16)/255.0
+    b = int(hex_color[4:6], 16)/255.0
+    a = 1.0
+    if len(hex_color) == 8:
+        a = int(hex_color[6:8], 16)/255.0
+    return (r, g, b, a)
+
+
+#########################################################################
+# Vectorized luminance / same numbers as linearize() but for whole images
+
+_LINEAR_LUT = np.array([linearize(i / 255.0) for i in range(256)])     # 8-bit channel -> linear, built with the scalar formula so it matches exactly
+
+_LUMINANCE_LUTS = (0.2126 * _LINEAR_LUT, 0.7152 * _LINEAR_LUT, 0.0722 * _LINEAR_LUT)     # weight folded in, same products as below
+
+def relative_luminance_u8(rgb):      # rgb = uint8 array (..., 3)
+    lin = _LINEAR_LUT[rgb]
+    return 0.2126 * lin[..., 0] + 0.7152 * lin[..., 1] + 0.0722 * lin[..., 2]
+
+def relative_luminance_u8_planes(rgb):       # same result, one lookup per channel, no (..., 3) float temp (for whole screenshots)
+    r, g, b = _LUMINANCE_LUTS
+    return r[rgb[..., 0]] + g[rgb[..., 1]] + b[rgb[..., 2]]
+
+
+#########################################################################
+# Perceptual color spaces / OKLCH and CIELAB (as LCh), batch kernels on numpy arrays
+
+OKLAB_M1 = np.array([                # linear sRGB -> LMS
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005],
+])
+OKLAB_M2 = np.array([                # LMS^(1/3) -> OKLab
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660],
+])
+OKLAB_M1_INV = np.linalg.inv(OKLAB_M1)
+OKLAB_M2_INV = np.linalg.inv(OKLAB_M2)
+
+SRGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+XYZ_TO_SRGB = np.linalg.inv(SRGB_TO_XYZ)
+D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+LAB_EPS = (6 / 29) ** 3
+
+def srgb_to_linear_array(c):         # colorspace transfer function (0.04045), not the WCAG one
+    c = np.asarray(c, dtype=np.float64)
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+def linear_to_srgb_array(c):
+    c = np.asarray(c, dtype=np.float64)
+    return np.where(c <= 0.0031308, c * 12.92, 1.055 * np.power(np.maximum(c, 0.0), 1 / 2.4) - 0.055)
+
+def linear_to_oklab(rgb):
+    return np.cbrt(rgb @ OKLAB_M1.T) @ OKLAB_M2.T
+
+def oklab_to_linear(lab):
+    return ((lab @ OKLAB_M2_INV.T) ** 3) @ OKLAB_M1_INV.T
+
+def linear_to_cielab(rgb):
+    xyz = (rgb @ SRGB_TO_XYZ.T) / D65_WHITE
+    f = np.where(xyz > LAB_EPS, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    L = 116.0 * f[..., 1] - 16.0
+    a = 500.0 * (f[..., 0] - f[..., 1])
+    b = 200.0 * (f[..., 1] - f[..., 2])
+    return np.stack([L, a, b], axis=-1)
+
+def cielab_to_linear(lab):
+    fy = (lab[..., 0] + 16.0) / 116.0
+    f = np.stack([fy + lab[..., 1] / 500.0, fy, fy - lab[..., 2] / 200.0], axis=-1)
+    xyz = np.where(f > 6 / 29, f ** 3, 3 * (6 / 29) ** 2 * (f - 4 / 29)) * D65_WHITE
+    return xyz @ XYZ_TO_SRGB.T
+
+def lch_to_lab(lch):
+    h = np.radians(lch[..., 2])
+    return np.stack([lch[..., 0], lch[..., 1] * np.cos(h), lch[..., 1] * np.sin(h)], axis=-1)
+
+def lab_to_lch(lab):
+    C = np.hypot(lab[..., 1], lab[..., 2])
+    h = np.degrees(np.arctan2(lab[..., 2], lab[..., 1])) % 360.0
+    return np.stack([lab[..., 0], C, h], axis=-1)
+
+PERCEPTUAL_SPACES = {                # L range, chroma that the slider maps to 100, kernels
+    "OKLCH": {"l_max": 1.0, "c_max": 0.37, "to_linear": oklab_to_linear, "from_linear": linear_to_oklab},
+    "CIELAB": {"l_max": 100.0, "c_max": 150.0, "to_linear": cielab_to_linear, "from_linear": linear_to_cielab},
+}
+COLOR_MODES = ["HSV"] + list(PERCEPTUAL_SPACES)
+GAMUT_LIGHTNESS_STEPS = 101          # one row per lightness slider position
+GAMUT_BISECT_ITERATIONS = 24
+
+def lch_to_srgb_array(space, lch):   # (..., 3) LCh -> sRGB 0..1, may be out of 0..1 if out of gamut
+    return linear_to_srgb_array(PERCEPTUAL_SPACES[space]["to_linear"](lch_to_lab(lch)))
+
+def srgb_to_lch_array(space, rgb):
+    return lab_to_lch(PERCEPTUAL_SPACES[space]["from_linear"](srgb_to_linear_array(rgb)))
+
+@functools.lru_cache(maxsize=None)
+def max_chroma_table(space):         # [lightness slider pos, hue degree] -> biggest chroma still inside sRGB, built once per space
+    info = PERCEPTUAL_SPACES[space]
+    L = np.linspace(0.0, info["l_max"], GAMUT_LIGHTNESS_STEPS)[:, None]
+    h = np.arange(361, dtype=np.float64)[None, :]
+    L, h = np.broadcast_arrays(L, h)
+    lo = np.zeros(L.shape)
+    hi = np.full(L.shape, info["c_max"] * 1.2)
+    for _ in range(GAMUT_BISECT_ITERATIONS):                 #all 36k cells at once, the boundary is crossed only once along chroma
+        mid = (lo + hi) / 2.0
+        lin = info["to_linear"](lch_to_lab(np.stack([L, mid, h], axis=-1)))
+        inside = np.all((lin >= -1e-9) & (lin <= 1.0 + 1e-9), axis=-1)
+        lo = np.where(inside, mid, lo)
+        hi = np.where(inside, hi, mid)
+    lo.setflags(write=False)
+    return lo
+
+def max_chroma_array(space, L, hue):             # table lookup with linear interpolation along lightness
+    table = max_chroma_table(space)
+    pos = np.clip(np.asarray(L) / PERCEPTUAL_SPACES[space]["l_max"] * (GAMUT_LIGHTNESS_STEPS - 1), 0, GAMUT_LIGHTNESS_STEPS - 1)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, GAMUT_LIGHTNESS_STEPS - 1)
+    col = np.rint(np.asarray(hue)).astype(np.int64) % 360
+    frac = pos - lo
+    return table[lo, col] * (1.0 - frac) + table[hi, col] * frac
+
+def srgb_to_hex_rounded(rgb, a=1.0):             # rounds instead of truncating, L=100 has to be #FFFFFF not #FEFEFE
+    r, g, b = (int(x) for x in np.rint(np.clip(rgb, 0.0, 1.0) * 255))
+    a_i = max(0, min(int(a*255), 255))
+    if a_i >= 255:
+        return f"#{r:02X}{g:02X}{b:02X}"
+    return f"#{r:02X}{g:02X}{b:02X}{a_i:02X}"
+
+def perceptual_sliders_to_hex(space, hue_pos, chroma_pos, light_pos, a=1.0):     # slider positions -> hex, chroma clipped by the table, no solving
+    info = PERCEPTUAL_SPACES[space]
+    chroma = min(chroma_pos / 100.0 * info["c_max"], max_chroma_table(space)[light_pos, hue_pos % 360])
+    rgb = lch_to_srgb_array(space, np.array([light_pos / 100.0 * info["l_max"], chroma, float(hue_pos)]))
+    return srgb_to_hex_rounded(rgb, a)
+
+def hex_to_perceptual_sliders(space, hex_color):      # -> (hue, chroma, lightness) slider positions, hue is None for grays
+    info = PERCEPTUAL_SPACES[space]
+    r, g, b, _ = hex_to_rgba(hex_color)
+    L, C, h = srgb_to_lch_array(space, np.array([r, g, b]))
+    hue = None if C < info["c_max"] * 0.002 else int(round(h)) % 360
+    chroma = int(round(min(C / info["c_max"], 1.0) * 100))
+    light = int(round(min(max(L / info["l_max"], 0.0), 1.0) * 100))
+    return hue, chroma, light
+
+
+#########################################################################
+# Rendered glyph contrast / what the text really looks like after anti-aliasing
+
+GLYPH_RENDER_SIZE = (300, 150)       # same size as the preview label
+
+def is_large_text(point_size, bold):          # WCAG: 18pt, or 14pt bold
+    return point_size >= 18 or (bold and point_size >= 14)
+
+@functools.lru_cache(maxsize=32)
+def glyph_coverage_mask(text, family, point_size, bold):
+    w, h = GLYPH_RENDER_SIZE
+    img = QImage(w, h, QImage.Format_Grayscale8)          #white text on black = how much of each pixel the glyph covers
+    img.fill(0)
+
+    font = QFont(family)
+    font.setPointSize(point_size)
+    font.setBold(bold)
+
+    painter = QPainter(img)
+    painter.setRenderHint(QPainter.TextAntialiasing, True)
+    painter.setFont(font)
+    painter.setPen(QColor(255, 255, 255))
+    painter.drawText(img.rect(), Qt.AlignCenter | Qt.TextWordWrap, text)
+    painter.end()
+
+    rows = np.frombuffer(img.constBits(), dtype=np.uint8).reshape(h, img.bytesPerLine())
+    coverage = rows[:, :w].astype(np.float64) / 255.0
+    coverage.setflags(write=False)                   # it lives in the cache, nobody should touch it
+    return coverage
+
+@functools.lru_cache(maxsize=256)
+def rendered_glyph_contrast(text, family, point_size, bold, fg_hex, bg_hex):
+    coverage = glyph_coverage_mask(text, family, point_size, bold)
+    ink = coverage > 0
+    if not ink.any():
+        return None
+
+    fr, fg, fb, fa = hex_to_rgba(fg_hex)
+    br, bg, bb, ba = hex_to_rgba(bg_hex)
+    bg_rgb = np.array([br, bg, bb]) * ba + (1.0 - ba)            # the label paints its BG over white
+    fg_rgb = np.array([fr, fg, fb]) * fa + bg_rgb * (1.0 - fa)
+
+    weights = coverage[ink]
+    cov = weights[:, None]
+    pixels = np.rint((fg_rgb * cov + bg_rgb * (1.0 - cov)) * 255).astype(np.uint8)     #the blended pixels like the rasterizer would write them
+    ink_lum = relative_luminance_u8(pixels)
+    bg_lum = relative_luminance_u8(np.rint(bg_rgb * 255).astype(np.uint8))
+
+    text_lum = float(np.average(ink_lum, weights=weights))       # thin strokes are mostly edge pixels so they pull this towards the BG
+    L1, L2 = max(text_lum, bg_lum), min(text_lum, bg_lum)
+    return (L1 + 0.05) / (L2 + 0.05)
+
+
+#########################################################################
+# Gradient backgrounds / worst case and area-weighted contrast over the whole gradient
+
+GRADIENT_SAMPLE_SIZE = (600, 300)    # 2x the preview label, every sample is a pixel of area
+GRADIENT_BINS = 4096                 # t resolution, way finer than the 256 levels a channel can have
+GRADIENT_KINDS = ["Linear", "Radial"]
+
+def parse_gradient_stops(text):      # "#FFFFFF 0%, #1E3A8A80 100%" -> ((0.0, "#FFFFFF"), (1.0, "#1E3A8A80"))
+    items = [item.strip() for item in text.split(",") if item.strip()]
+    if not items:
+        raise ValueError("No gradient stops.")
+
+    parsed = []
+    for item in items:
+        parts = item.split()
+        if len(parts) > 2:
+            raise ValueError(f"Invalid gradient stop: {item!r}")
+        color = normalize_hex(parts[0])
+        pos = None
+        if len(parts) > 1:
+            if parts[1] == "0":
+                pos = 0.0
+            elif parts[1].endswith("%"):
+                try:
+                    pos = float(parts[1][:-1]) / 100.0
+                except ValueError:
+                    raise ValueError(f"Invalid stop position: {parts[1]!r}") from None
+            else:
+                raise ValueError(f"Stop position needs a %: {parts[1]!r}")
+            pos = max(0.0, min(pos, 1.0))
+        parsed.append([pos, color])
+
+    if parsed[0][0] is None:                      # like CSS, missing positions are spread evenly
+        parsed[0][0] = 0.0
+    if parsed[-1][0] is None:
+        parsed[-1][0] = 1.0
+    highest = 0.0
+    for stop in parsed:                           # like CSS, a stop before an earlier one moves up to it (hard stops keep their order)
+        if stop[0] is not None:
+            stop[0] = highest = max(stop[0], highest)
+    i = 0
+    while i < len(parsed):
+        if parsed[i][0] is None:
+            j = i
+            while parsed[j][0] is None:
+                j += 1
+            start, end = parsed[i - 1][0], parsed[j][0]
+            for k in range(i, j):
+                parsed[k][0] = start + (end - start) * (k - i + 1) / (j - i + 1)
+            i = j
+        i += 1
+
+    return tuple((pos, color) for pos, color in parsed)
+
+def linear_gradient_line(angle):     # CSS angle (0 = to top, 90 = to right) -> x1, y1, x2, y2 in bounding box units
+    rad = np.radians(angle)
+    dx, dy = np.sin(rad), -np.cos(rad)
+    half = (abs(dx) + abs(dy)) / 2.0               #so the corners land exactly on 0% and 100%
+    return 0.5 - dx * half, 0.5 - dy * half, 0.5 + dx * half, 0.5 + dy * half
+
+def gradient_positions(kind, angle, width, height):            # t in 0..1 for every sample of the box
+    u = (np.arange(width) + 0.5) / width
+    v = (np.arange(height) + 0.5) / height
+    uu, vv = np.meshgrid(u, v)
+    if kind == "Radial":
+        t = np.hypot((uu - 0.5) * 2.0, (vv - 0.5) * 2.0)        # ellipse touching the edges, same as qradialgradient radius 0.5
+    else:
+        x1, y1, x2, y2 = linear_gradient_line(angle)
+        dx, dy = x2 - x1, y2 - y1
+        t = ((uu - x1) * dx + (vv - y1) * dy) / (dx * dx + dy * dy)
+    return np.clip(t, 0.0, 1.0)
+
+def sample_gradient(stops, t):       # -> uint8 rgb array, composited over white like the preview
+    positions = np.array([pos for pos, _ in stops])
+    rgba = np.array([hex_to_rgba(color) for _, color in stops])
+    alpha = np.interp(t, positions, rgba[:, 3])
+    rgb = np.empty(t.shape + (3,))
+    for ch in range(3):
+        premultiplied = np.interp(t, positions, rgba[:, ch] * rgba[:, 3])       #interpolate premultiplied, otherwise transparent stops bleed their color
+        rgb[..., ch] = premultiplied + (1.0 - alpha)
+    return np.rint(np.clip(rgb, 0.0, 1.0) * 255).astype(np.uint8)
+
+@functools.lru_cache(maxsize=32)
+def gradient_position_histogram(kind, angle):      #how much of the box sits at each t, only depends on the geometry
+    w, h = GRADIENT_SAMPLE_SIZE
+    t = gradient_positions(kind, angle, w, h)
+    bins = np.minimum((t * GRADIENT_BINS).astype(np.int64), GRADIENT_BINS - 1)
+    counts = np.bincount(bins.ravel(), minlength=GRADIENT_BINS)
+    used = np.nonzero(counts)[0]
+    return (used + 0.5) / GRADIENT_BINS, counts[used]
+
+@functools.lru_cache(maxsize=64)
+def gradient_contrast(fg_hex, stops, kind, angle):
+    t, area = gradient_position_histogram(kind, angle)       # editing stops or colors only re-samples the bins, not the whole box
+    bg = sample_gradient(stops, t)
+
+    fr, fg, fb, fa = hex_to_rgba(fg_hex)
+    fg_rgb = np.array([fr, fg, fb])
+    if fa < 1.0:                                   # see-through text takes some of the gradient under it
+        text = np.rint(fg_rgb * 255 * fa + bg * (1.0 - fa)).astype(np.uint8)
+        fg_lum = relative_luminance_u8(text)
+    else:
+        fg_lum = relative_luminance_u8(np.rint(fg_rgb * 255).astype(np.uint8))
+
+    bg_lum = relative_luminance_u8(bg)
+    L1 = np.maximum(fg_lum, bg_lum)
+    L2 = np.minimum(fg_lum, bg_lum)
+    ratios = (L1 + 0.05) / (L2 + 0.05)
+    total = area.sum()
+    return {
+        "worst": float(ratios.min()),
+        "weighted": float((ratios * area).sum() / total),
+        "best": float(ratios.max()),
+        "aa_area": float(area[ratios >= 4.5].sum() / total),
+    }
+
+def gradient_qss(stops, kind, angle):         # same gradient as a Qt stylesheet brush for the preview
+    stop_txt = ", ".join(f"stop:{pos:.4f} {hex_to_rgba_str(color)}" for pos, color in stops)
+    if kind == "Radial":
+        return f"qradialgradient(cx:0.5, cy:0.5, radius:0.5, fx:0.5, fy:0.5, {stop_txt})"
+    x1, y1, x2, y2 = linear_gradient_line(angle)
+    return f"qlineargradient(x1:{x1:.4f}, y1:{y1:.4f}, x2:{x2:.4f}, y2:{y2:.4f}, {stop_txt})"
+
+
+#########################################################################
+# Palette generator / N passing shades per hue, hues split across processes
+
+PALETTE_LEVELS = {"AA": 4.5, "AAA": 7.0}
+PALETTE_SEARCH_STEPS = 1024         # brightness values tried per hue...
+PALETTE_SAT_STEPS = 32               # ...times saturation values
+
+def hsv_to_rgb_array(h, s, v):       # colorsys.hsv_to_rgb for numpy arrays
+    h, s, v = np.broadcast_arrays(np.asarray(h, dtype=np.float64), s, v)
+    i = np.floor(h * 6.0)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i.astype(np.int64) % 6
+    r = np.choose(i, [v, q, p, p, t, v])
+    g = np.choose(i, [t, v, v, q, p, p])
+    b = np.choose(i, [p, p, t, v, v, q])
+    gray = s == 0.0
+    return np.stack([np.where(gray, v, r), np.where(gray, v, g), np.where(gray, v, b)], axis=-1)
+
+def luminance_to_lightness(Y):       # CIE L*, so "evenly spaced" looks even
+    Y = np.asarray(Y, dtype=np.float64)
+    return np.where(Y > 216 / 24389, 116.0 * np.cbrt(Y) - 16.0, Y * 24389 / 27)
+
+def pick_even_shades(lightness, saturation, steps, tolerance=1.0):
+    targets = np.linspace(lightness.min(), lightness.max(), steps)
+    picked = []
+    for target in targets:                       #evenly spaced in L*, and the most saturated candidate close to each step
+        near = np.flatnonzero(np.abs(lightness - target) <= tolerance)
+        if near.size:
+            idx = int(near[saturation[near].argmax()])
+        else:
+            idx = int(np.abs(lightness - target).argmin())
+        if idx not in picked:
+            picked.append(idx)
+    return picked
+
+def palette_candidates(space, hue, max_saturation):     # -> (rgb8, saturation) of every color tried for one hue
+    s = np.linspace(max_saturation, 0.0, PALETTE_SAT_STEPS)[:, None]        # saturation is a maximum, it drops when the hue cant pass otherwise
+    v = np.linspace(0.0, 1.0, PALETTE_SEARCH_STEPS)[None, :]
+    s, v = np.broadcast_arrays(s, v)
+    s, v = s.ravel(), v.ravel()
+    if space == "HSV":
+        return np.clip((hsv_to_rgb_array(hue, s, v) * 255).astype(np.int64), 0, 255), s       # truncates like rgb_to_hex()
+    L = v * PERCEPTUAL_SPACES[space]["l_max"]                   #same grid as lightness x chroma, chroma as a share of what fits in sRGB there
+    C = s * max_chroma_array(space, L, hue * 360.0)
+    rgb = lch_to_srgb_array(space, np.stack([L, C, np.full(L.shape, hue * 360.0)], axis=-1))
+    return np.rint(np.clip(rgb, 0.0, 1.0) * 255).astype(np.int64), s                       # rounds like srgb_to_hex_rounded()
+
+def generate_hue_shades(hue, max_saturation, bg_hex, target, steps, space="HSV"):
+    rgb8, s = palette_candidates(space, hue, max_saturation)
+
+    lum = relative_luminance_u8(rgb8)
+    bg_lum = hex_luminance(bg_hex)
+    ratios = (np.maximum(lum, bg_lum) + 0.05) / (np.minimum(lum, bg_lum) + 0.05)
+    passing = ratios >= target
+
+    best = []
+    best_span = -1.0
+    for side in (lum < bg_lum, lum > bg_lum):             #darker than the BG or lighter, keep the side with more room
+        idx = np.flatnonzero(passing & side)
+        if idx.size == 0:
+            continue
+        light = luminance_to_lightness(lum[idx])
+        if np.ptp(light) > best_span:
+            best_span = np.ptp(light)
+            best = [idx[i] for i in pick_even_shades(light, s[idx], steps)]
+
+    verified = []
+    for r, g, b in rgb8[best]:                   #guaranteed: every shade is checked again with the normal formula
+        hex_color = f"#{r:02X}{g:02X}{b:02X}"
+        ratio = contrast_ratio(hex_color, bg_hex)
+        if ratio >= target and all(hex_color != h for h, _ in verified):
+            verified.append((hex_color, ratio))
+    verified.sort(key=lambda item: hex_luminance(item[0]), reverse=True)
+    return verified
+
+def generate_palette_chunk(hues, saturation, bg_hex, target, steps, space="HSV"):      # runs in a worker process
+    return [(hue, generate_hue_shades(hue, saturation, bg_hex, target, steps, space)) for hue in hues]
+
+def palette_hues(count):
+    return [i / count for i in range(count)]
+
+def split_hues(hues, parts):
+    parts = max(1, min(parts, len(hues)))
+    return [hues[i::parts] for i in range(parts)]
+
+_palette_pool = None
+
+def palette_pool():                  # started once, reused for every generate
+    global _palette_pool
+    if _palette_pool is None:
+        _palette_pool = ProcessPoolExecutor(             # spawn, forking a process that runs Qt threads can deadlock the child
+            max_workers=max(1, min(8, (os.cpu_count() or 2) - 1)),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _palette_pool
+
+def shutdown_palette_pool():         # on close, or after a worker died and broke the pool, the next generate starts a new one
+    global _palette_pool
+    if _palette_pool is not None:
+        _palette_pool.shutdown(wait=False, cancel_futures=True)
+        _palette_pool = None
+
+def palette_chunk_result(future):    # the rows, or the exception so the UI can show it, never recomputed on the callback thread
+    if future.cancelled():
+        return RuntimeError("palette generation was cancelled")
+    error = future.exception()
+    return future.result() if error is None else error
+
+def export_palette_tokens(palette, bg_hex, level, path):       # DTCG json, import_tokens() can read it back
+    import json
+    group = {"$type": "color", "background": {"$value": bg_hex}}
+    for hue, shades in palette:
+        hue_group = {}
+        for step, (hex_color, ratio) in enumerate(shades, start=1):
+            hue_group[str(step * 100)] = {
+                "$value": hex_color,
+                "$extensions": {"contrast": {"background": "{palette.background}", "ratio": round(ratio, 2), "level": level}},
+            }
+        group[f"hue-{round(hue * 360):03d}"] = hue_group
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"palette": group}, f, indent=1)
+
+
+class PaletteSignals(QObject):        # pool callbacks -> UI thread
+    chunk_done = Signal(int, object)
+
+
+#########################################################################
+# Design tokens / import DTCG json, CSS custom properties and Tailwind configs
+
+TOKEN_FG_NAMES = {"text", "fg", "foreground", "on", "content", "label"}      #naming convention for pairs: "button.primary.text" + "button.primary.bg"
+TOKEN_BG_NAMES = {"bg", "background", "surface", "fill", "container"}
+TOKEN_READ_CHUNK = 1 << 16
+TOKEN_CARRY_LIMIT = 4096             # chars kept between chunks, a declaration longer than this is broken anyway
+CSS_EXTRA_NAMED_COLORS = {"rebeccapurple": "#663399"}      # css names that are not in Qt's svg color table
+
+_SHORT_HEX_RE = re.compile(r"^#([0-9A-Fa-f]{3,4})$")
+_RGB_FUNC_RE = re.compile(r"^rgba?\(\s*([\d.]+%?)[\s,]+([\d.]+%?)[\s,]+([\d.]+%?)(?:[\s,/]+([\d.]+%?))?\s*\)$")
+_DTCG_ALIAS_RE = re.compile(r"^\{([^{}]+)\}$")
+_CSS_VAR_RE = re.compile(r"^var\(\s*(--[\w-]+)\s*(?:,\s*(.+))?\)$")
+_CSS_DECL_RE = re.compile(r"(--[\w-]+)\s*:\s*([^;{}]+);")
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_COLOR_NAME_RE = re.compile(r"^[A-Za-z]+$")
+_TAILWIND_RE = re.compile(
+    r"""(?P<open>['"]?(?P<okey>[\w-]+)['"]?\s*:\s*\{)"""
+    r"""|(?P<leaf>['"]?(?P<lkey>[\w-]+)['"]?\s*:\s*(?P<q>['"])(?P<value>.*?)(?P=q))"""
+    r"""|(?P<brace>[{}])"""
+)
+
+def parse_css_color(value):          # "#abc", "#AABBCC80", "rgb(1 2 3 / 50%)" -> "#RRGGBB[AA]", None if its not a color we know
+    if isinstance(value, dict):                  # DTCG 2025 color object
+        if "hex" in value:
+            return parse_css_color(value["hex"])
+        comps = value.get("components")
+        if value.get("colorSpace", "srgb") == "srgb" and comps and len(comps) == 3:
+            return rgb_to_hex(*comps, value.get("alpha", 1.0))
+        return None
+    if not isinstance(value, str):
+        return None
+
+    value = value.strip()
+    short = _SHORT_HEX_RE.match(value)
+    if short:
+        return "#" + "".join(ch * 2 for ch in short.group(1)).upper()
+    if _HEX_RE.match(value) and value.startswith("#"):
+        return normalize_hex(value)
+
+    func = _RGB_FUNC_RE.match(value.lower())
+    if func:
+        def channel(txt, scale):
+            return float(txt[:-1]) / 100.0 if txt.endswith("%") else float(txt) / scale
+        r, g, b = (channel(func.group(i), 255.0) for i in (1, 2, 3))
+        a = channel(func.group(4), 1.0) if func.group(4) else 1.0
+        return rgb_to_hex(r, g, b, a)
+
+    if _COLOR_NAME_RE.match(value):              # white, black, rebeccapurple, transparent...
+        name = value.lower()
+        if name in CSS_EXTRA_NAMED_COLORS:
+            return CSS_EXTRA_NAMED_COLORS[name]
+        if QColor.isValidColorName(name):
+            color = QColor(name)
+            alpha = f"{color.alpha():02X}" if color.alpha() < 255 else ""
+            return f"#{color.red():02X}{color.green():02X}{color.blue():02X}{alpha}"
+    return None
+
+def token_alias(value):              # "{color.red}" / "var(--red)" -> referenced token name
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    m = _DTCG_ALIAS_RE.match(value)
+    if m:
+        return m.group(1)
+    m = _CSS_VAR_RE.match(value)
+    if m:
+        return m.group(1)
+    return None
+
+def css_var_fallback(value):         # "var(--red, #f00)" -> "#f00", None without a fallback
+    if not isinstance(value, str):
+        return None
+    m = _CSS_VAR_RE.match(value.strip())
+    return m.group(2).strip() if m and m.group(2) else None
+
+
+class TokenSet:
+    def __init__(self, source=""):
+        self.source = source
+        self.raw = {}                # token name -> value as written in the file
+        self.pair_hints = []         # (fg name, bg name) declared in the file
+        self._resolved = {}          # memo: token name -> hex (or None)
+
+    def add(self, name, value):
+        self.raw[name] = value
+        self._resolved.pop(name, None)
+
+    def resolve(self, name):         # follows alias chains without recursion, every token in a chain gets memoized
+        if name in self._resolved:
+            return self._resolved[name]
+
+        chain = []
+        seen = set()
+        current = name
+        while True:
+            if current in self._resolved:
+                result = self._resolved[current]
+                break
+            if current in seen:
+                raise ValueError(f"Alias cycle: {' -> '.join(chain + [current])}")
+            if current not in self.raw:
+                raise ValueError(f"Unknown token: {current}")
+            seen.add(current)
+            chain.append(current)
+
+            value = self.raw[current]
+            target = token_alias(value)
+            while target is not None and target not in self.raw:        # var(--missing, fallback), the fallback can be another var()
+                value = css_var_fallback(value)
+                if value is None:
+                    raise ValueError(f"Unknown token: {target}")
+                target = token_alias(value)
+            if target is None:
+                result = parse_css_color(value)
+                break
+            current = target
+
+        for token in chain:
+            self._resolved[token] = result
+        return result
+
+    def naming_pairs(self):           # "x.y.text" goes with "x.y.bg" (also works with - and _)
+        by_prefix = {}
+        for name in self.raw:
+            parts = re.split(r"[.\-_]+", name.strip("-").lower())
+            if len(parts) < 2:
+                continue
+            prefix = tuple(parts[:-1])
+            if parts[-1] in TOKEN_FG_NAMES:
+                by_prefix.setdefault(prefix, ([], []))[0].append(name)
+            elif parts[-1] in TOKEN_BG_NAMES:
+                by_prefix.setdefault(prefix, ([], []))[1].append(name)
+
+        pairs = []
+        for fg_names, bg_names in by_prefix.values():
+            for fg_name in fg_names:
+                for bg_name in bg_names:
+                    pairs.append((fg_name, bg_name))
+        return pairs
+
+    def pairs(self):
+        seen = set()
+        result = []
+        for pair in self.pair_hints + self.naming_pairs():
+            if pair not in seen:
+                seen.add(pair)
+                result.append(pair)
+        return result
+
+
+def parse_dtcg_json(path):           # W3C design tokens: groups are dicts, tokens are dicts with "$value"
+    import json
+    with open(path, "r", encoding="utf-8") as f:
+        tree = json.load(f)
+
+    tokens = TokenSet(path)
+    stack = [((), tree, None)]
+    while stack:                     # iterative walk, deep groups wont blow the recursion limit
+        path_parts, node, inherited_type = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        node_type = node.get("$type", inherited_type)
+        if "$value" in node:
+            if node_type not in (None, "color"):
+                continue
+            name = ".".join(path_parts)
+            tokens.add(name, node["$value"])
+
+            backgrounds = node.get("$extensions", {}).get("contrast", {}).get("background", [])      #explicit pairing: {"$extensions": {"contrast": {"background": "{color.bg}"}}}
+            if isinstance(backgrounds, str):
+                backgrounds = [backgrounds]
+            for bg in backgrounds:
+                tokens.pair_hints.append((name, token_alias(bg) or bg))
+            continue
+        for key, child in node.items():
+            if not key.startswith("$"):
+                stack.append((path_parts + (key,), child, node_type))
+    return tokens
+
+def iter_file_chunks(path):
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(TOKEN_READ_CHUNK)
+            if not chunk:
+                return
+            yield chunk
+
+def parse_css_properties(path):      # --name: value;  read in chunks, only the unfinished declaration is kept between chunks
+    tokens = TokenSet(path)
+    carry = ""
+    for chunk in iter_file_chunks(path):
+        buf = _CSS_COMMENT_RE.sub(" ", carry + chunk)        #commented out declarations are not tokens
+        open_comment = buf.find("/*")
+        if open_comment >= 0:            # comment continues in the next chunk, only "/*" and its last char are kept
+            buf, comment = buf[:open_comment], "/*" + buf[open_comment + 2:][-1:]
+        else:
+            comment = ""
+        end = 0
+        for m in _CSS_DECL_RE.finditer(buf):
+            tokens.add(m.group(1), m.group(2).strip())
+            end = m.end()
+        carry = buf[max(end, buf.rfind(";") + 1, buf.rfind("}") + 1):]
+        if len(carry) > TOKEN_CARRY_LIMIT:   # long whitespace or selector lists before it, the unfinished declaration is at the end
+            carry = carry[-TOKEN_CARRY_LIMIT:]
+        carry += comment
+    return tokens
+
+def parse_tailwind_config(path):     # theme.colors / theme.extend.colors in a tailwind config, nested objects become dotted names
+    tokens = TokenSet(path)
+    keys = []
+    carry = ""
+    for chunk in iter_file_chunks(path):
+        buf = carry + chunk
+        end = 0
+        for m in _TAILWIND_RE.finditer(buf):
+            if m.group("open"):
+                keys.append(m.group("okey"))
+            elif m.group("leaf"):
+                if "colors" in keys:
+                    name = ".".join(keys[keys.index("colors"):] + [m.group("lkey")])
+                    if parse_css_color(m.group("value")):
+                        tokens.add(name, m.group("value"))
+            elif m.group("brace") == "{":
+                keys.append("")
+            elif keys:
+                keys.pop()
+            end = m.end()
+        carry = buf[end:][-256:]                   #an unfinished entry is never that long
+    return tokens
+
+def load_token_file(path):
+    lower = path.lower()
+    if lower.endswith(".json"):
+        return parse_dtcg_json(path)
+    if lower.endswith(".css"):
+        return parse_css_properties(path)
+    return parse_tailwind_config(path)
+
+def audit_token_pairs(tokens):       # -> (entries, errors)
+    entries = []
+    errors = []
+    for fg_name, bg_name in tokens.pairs():
+        try:
+            fg_hex = tokens.resolve(fg_name)
+            bg_hex = tokens.resolve(bg_name)
+        except ValueError as e:
+            errors.append(str(e))
+            continue
+        if fg_hex is None or bg_hex is None:
+            errors.append(f"Not a color: {fg_name if fg_hex is None else bg_name}")
+            continue
+        ratio = ratio_from_luminance(hex_luminance(fg_hex), hex_luminance(bg_hex))
+        entries.append({
+            "name": f"{fg_name} on {bg_name}",
+            "foreground": fg_hex,
+            "background": bg_hex,
+            "ratio": ratio,
+            "results": check_conformance(ratio),
+        })
+    return entries, errors
+
+
+# Audit export
+
+SARIF_RULES = [                      # (rule id, check_conformance key, sarif level)
+    ("1.4.3", "AA (Normal Text)", "error"),
+    ("1.4.6", "AAA (Normal Text)", "warning"),
+]
+
+def export_audit_json(entries, path):
+    import json
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"tool": "ColorContrast", "pairs": entries}, f, indent=1)
+
+def export_audit_sarif(entries, path, source_uri=None):
+    import json
+    rules = [
+        {"id": "1.4.3", "name": "ContrastMinimum", "shortDescription": {"text": "Contrast (Minimum), 4.5:1"}},
+        {"id": "1.4.6", "name": "ContrastEnhanced", "shortDescription": {"text": "Contrast (Enhanced), 7:1"}},
+    ]
+    results = []
+    for entry in entries:
+        for rule_id, key, level in SARIF_RULES:
+            if entry["results"][key] == "Pass":
+                continue
+            result = {
+                "ruleId": rule_id,
+                "level": level,
+                "message": {"text": f"{entry['name']}: {entry['foreground']} on {entry['background']} has contrast {entry['ratio']:.2f}"},
+                "locations": [{"logicalLocations": [{"fullyQualifiedName": entry["name"]}]}],
+            }
+            if source_uri:
+                result["locations"][0]["physicalLocation"] = {"artifactLocation": {"uri": source_uri}}
+            results.append(result)
+
+    sarif = {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [{"tool": {"driver": {"name": "ColorContrast", "rules": rules}}, "results": results}],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(sarif, f, indent=1)
+
+
+#########################################################################
+# Result card / native widgets, the labels get updated in place
+
+RESULT_THEME_COLORS = {               # dark mode? -> colors
+    False: {"card": "#f9f9f9", "text": "#333", "pass": "#2e7d32", "fail": "#d32f2f"},
+    True: {"card": "#333", "text": "#eee", "pass": "lime", "fail": "salmon"},
+}
+
+@functools.lru_cache(maxsize=None)
+def result_card_stylesheet(dark):
+    colors = RESULT_THEME_COLORS[dark]
+    return (
+        f"QFrame#resultCard {{ background: {colors['card']}; border: 1px solid rgba(0,0,0,40); border-radius: 8px; }}"
+        f"QFrame#resultCard QLabel {{ color: {colors['text']}; background: transparent; border: none; }}"
+    )
+
+@functools.lru_cache(maxsize=None)
+def result_row_output(label, status, dark):        # (icon, icon stylesheet, text), one entry per criterion label/status/theme
+    colors = RESULT_THEME_COLORS[dark]
+    if status.lower() == "pass":
+        icon, color = "✔", colors["pass"]          #yes or no icons
+    elif status.lower() == "fail":
+        icon, color = "✖", colors["fail"]
+    else:
+        icon, color = "?", colors["text"]
+    return icon, f"color: {color};", f"{label}: {status}"
+
+
+class ResultCard(QFrame):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("resultCard")
+        self.dark = False
+        self.current = {}              # label -> (text, stylesheet) already on screen
+
+        self.header_icon = QLabel("")
+        self.header = QLabel("Result will appear here")
+        header_font = QFont()
+        header_font.setBold(True)
+        header_font.setPointSize(header_font.pointSize() + 1)
+        self.header.setFont(header_font)
+        self.header_icon.setFont(header_font)
+        self.header_icon.hide()
+        self.detail = QLabel("")
+        self.detail.setWordWrap(True)
+        self.detail.hide()
+
+        header_row = QHBoxLayout()
+        header_row.addWidget(self.header_icon)
+        header_row.addWidget(self.header, 1)
+
+        self.grid = QGridLayout()
+        self.grid.setColumnStretch(0, 1)
+        self.rows = []                 # (title, icon, status) labels per criterion
+
+        layout = QVBoxLayout()
+        layout.addLayout(header_row)
+        layout.addWidget(self.detail)
+        layout.addLayout(self.grid)
+        self.setLayout(layout)
+        self.setStyleSheet(result_card_stylesheet(False))
+
+    def _set(self, label, text, style=None):           #skip the label if nothing changed, no relayout
+        if self.current.get(label) == (text, style):
+            return
+        self.current[label] = (text, style)
+        label.setText(text)
+        if style is not None:
+            label.setStyleSheet(style)
+
+    def _ensure_rows(self, count):
+        title_font = QFont()
+        title_font.setBold(True)
+        while len(self.rows) < count:
+            row = len(self.rows)
+            title, icon, status = QLabel(""), QLabel(""), QLabel("")
+            title.setFont(title_font)
+            self.grid.addWidget(title, row, 0)
+            self.grid.addWidget(icon, row, 1)
+            self.grid.addWidget(status, row, 2)
+            self.rows.append((title, icon, status))
+
+    def set_theme(self, dark):
+        if dark == self.dark:
+            return
+        self.dark = dark
+        self.setStyleSheet(result_card_stylesheet(dark))
+        self.current.clear()             # icon colors have to be re-applied
+
+    def show_result(self, ratio, criteria, detail=None):
+        self.header_icon.hide()
+        self._set(self.header, f"WCAG Criteria – Contrast ratio: {ratio:.2f}")
+        if detail is None:
+            self.detail.hide()
+        else:
+            self._set(self.detail, detail)
+            self.detail.show()
+
+        self._ensure_rows(len(criteria))
+        for (title, icon, status), crit in zip(self.rows, criteria):
+            icon_text, icon_style, status_text = result_row_output(
+                crit.get("label", "Text"), crit.get("status", "N/A"), self.dark
+            )
+            self._set(title, crit.get("title", "Criterion"))
+            self._set(icon, icon_text, icon_style)
+            self._set(status, status_text)
+            for w in (title, icon, status):
+                w.show()
+        for row in self.rows[len(criteria):]:
+            for w in row:
+                w.hide()
+
+    def show_fail(self, msg):
+        icon_text, icon_style, _ = result_row_output("", "Fail", self.dark)
+        self._set(self.header_icon, icon_text, icon_style)
+        self.header_icon.show()
+        self._set(self.header, "Fail")
+        self._set(self.detail, msg)
+        self.detail.show()
+        for row in self.rows:
+            for w in row:
+                w.hide()
+
+
+#########################################################################
+# Worksheet / many fg-bg pairs at once
+
+class ContrastPairsModel(QAbstractTableModel):
+    COLUMNS = ["Name", "Foreground", "Background", "Ratio", "AA", "AA Large", "AAA"]
+    NAME, FG, BG, RATIO, AA, AA_LARGE, AAA = range(7)
+    ROW_RATIO = 5                    # where compute_row() puts the ratio
+
+    RESULT_KEYS = {                  # column -> key of check_conformance()
+        AA: "AA (Normal Text)",
+        AA_LARGE: "AA (Large Text)",
+        AAA: "AAA (Normal Text)",
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []               # [name, fg_hex, bg_hex, fg_lum, bg_lum, ratio, results]
+        self.sort_key = None         # (column, order) of the last sort, kept when rows are added or edited
+
+    @staticmethod
+    def compute_row(name, fg_hex, bg_hex):         #everything the view needs is cached in the row, painting never does math
+        fg_lum = hex_luminance(fg_hex)
+        bg_lum = hex_luminance(bg_hex)
+        ratio = ratio_from_luminance(fg_lum, bg_lum)
+        return [name, fg_hex, bg_hex, fg_lum, bg_lum, ratio, check_conformance(ratio)]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() in (self.NAME, self.FG, self.BG):
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name, fg_hex, bg_hex, fg_lum, bg_lum, ratio, results = self.rows[index.row()]
+        col = index.column()
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if col == self.NAME:
+                return name
+            if col == self.FG:
+                return fg_hex
+            if col == self.BG:
+                return bg_hex
+            if col == self.RATIO:
+                return f"{ratio:.2f}"
+            return results[self.RESULT_KEYS[col]]
+
+        if role == Qt.DecorationRole and col in (self.FG, self.BG):
+            return QColor(fg_hex[:7] if col == self.FG else bg_hex[:7])
+
+        if role == Qt.ForegroundRole and col in self.RESULT_KEYS:
+            return QColor("#2e7d32") if results[self.RESULT_KEYS[col]] == "Pass" else QColor("#d32f2f")
+
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        row = self.rows[index.row()]
+        col = index.column()
+        try:
+            if col == self.NAME:
+                name, fg_hex, bg_hex = str(value), row[1], row[2]
+            elif col == self.FG:
+                name, fg_hex, bg_hex = row[0], normalize_hex(str(value)), row[2]
+            elif col == self.BG:
+                name, fg_hex, bg_hex = row[0], row[1], normalize_hex(str(value))
+            else:
+                return False
+        except ValueError:
+            return False
+
+        self.rows[index.row()] = self.compute_row(name, fg_hex, bg_hex)          #only this row gets recomputed
+        self.dataChanged.emit(
+            self.index(index.row(), 0), self.index(index.row(), len(self.COLUMNS) - 1)
+        )
+        self.resort()
+        return True
+
+    def ratio(self, row):
+        return self.rows[row][self.ROW_RATIO]
+
+    def sort(self, column, order=Qt.AscendingOrder):          #plain list.sort on the cached values, way faster than letting the proxy compare index by index
+        self.sort_key = (column, order)
+        key_index = {self.NAME: 0, self.FG: 3, self.BG: 4}.get(column, self.ROW_RATIO)
+        if key_index == 0:
+            key = lambda row: row[0].lower()
+        else:
+            key = lambda row: row[key_index]
+
+        self.layoutAboutToBeChanged.emit()
+        old_persistent = self.persistentIndexList()
+        old_rows = [id(self.rows[index.row()]) for index in old_persistent]
+
+        self.rows.sort(key=key, reverse=(order == Qt.DescendingOrder))
+
+        new_position = {id(row): i for i, row in enumerate(self.rows)}        # keep the selection on the same pairs
+        self.changePersistentIndexList(
+            old_persistent,
+            [self.index(new_position[row_id], index.column()) for row_id, index in zip(old_rows, old_persistent)]
+        )
+        self.layoutChanged.emit()
+
+    def resort(self):                # after an edit or an insert, nearly sorted so list.sort is close to linear
+        if self.sort_key is not None:
+            self.sort(*self.sort_key)
+
+    def add_pairs(self, pairs):          # pairs = [(name, fg, bg), ...]
+        new_rows = [self.compute_row(name, normalize_hex(fg), normalize_hex(bg)) for name, fg, bg in pairs]
+        if not new_rows:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+        self.rows.extend(new_rows)
+        self.endInsertRows()
+        self.resort()
+
+    def remove_rows(self, row_numbers):
+        for row in sorted(set(row_numbers), reverse=True):        #from the bottom so the indexes dont move
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.rows[row]
+            self.endRemoveRows()
+
+    def audit_entries(self):          # same shape as audit_token_pairs(), for the exporters
+        return [
+            {"name": name, "foreground": fg_hex, "background": bg_hex, "ratio": ratio, "results": results}
+            for name, fg_hex, bg_hex, _, _, ratio, results in self.rows
+        ]
+
+    def clear(self):
+        self.beginResetModel()
+        self.rows = []
+        self.endResetModel()
+
+
+class FailureFilterProxy(QSortFilterProxyModel):
+    FILTERS = ["All pairs", "Failing AA", "Failing AA Large", "Failing AAA"]
+    THRESHOLDS = {1: 4.5, 2: 3.0, 3: 7.0}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.mode = 0
+        self.setDynamicSortFilter(False)          # the source model does the sorting, this one only filters
+
+    def setSourceModel(self, model):              # without dynamic filtering edits and new rows have to re-filter by hand
+        super().setSourceModel(model)
+        for signal in (model.dataChanged, model.rowsInserted, model.modelReset, model.layoutChanged):
+            signal.connect(self.refilter)
+
+    def refilter(self, *args):
+        if self.mode != 0:
+            self.invalidateFilter()
+
+    def set_mode(self, mode):
+        self.mode = mode
+        self.invalidateFilter()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.mode == 0:
+            return True
+        ratio = self.sourceModel().ratio(source_row)
+        return ratio < self.THRESHOLDS[self.mode]
+
+
+#########################################################################
+# Session storage / colors, swatches, recent images and theme survive a restart
+
+RECENT_IMAGE_LIMIT = 8
+THUMBNAIL_SIZE = 64
+COLD_START_BUDGET_MS = 1500          # from process start to the first painted window
+
+def default_session_path():
+    folder = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, "session.sqlite3")
+
+
+class SessionSignals(QObject):         # worker thread -> UI thread
+    loaded = Signal(dict)
+    load_failed = Signal(str)
+    failed = Signal(str)               # a save went wrong, the message is for the status line
+
+
+class SessionStore:
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT);
+    CREATE TABLE IF NOT EXISTS swatches (pos INTEGER PRIMARY KEY, rgb INTEGER);
+    CREATE TABLE IF NOT EXISTS recent_images (path TEXT PRIMARY KEY, opened REAL, thumb BLOB);
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.signals = SessionSignals()
+        self._db = None
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session")      #one thread owns the sqlite connection, the UI never waits on disk
+
+    def _conn(self):                 # only called on the worker thread
+        if self._db is None:
+            self._db = sqlite3.connect(self.path)
+            self._db.executescript(self.SCHEMA)
+        return self._db
+
+    def load_async(self):
+        self._worker.submit(self._load)
+
+    def _load(self):
+        try:
+            db = self._conn()
+            settings = dict(db.execute("SELECT key, value FROM settings"))
+            swatches = [rgb for (rgb,) in db.execute("SELECT rgb FROM swatches ORDER BY pos")]
+            recent = []
+            for path, blob in db.execute("SELECT path, thumb FROM recent_images ORDER BY opened DESC"):
+                thumb = QImage()
+                thumb.loadFromData(blob, "PNG")              # QImage is fine off the UI thread, QPixmap is not
+                recent.append((path, thumb))
+        except sqlite3.Error as e:
+            self.signals.load_failed.emit(f"Session not restored: {e}")
+            return
+        self.signals.loaded.emit({"settings": settings, "swatches": swatches, "recent": recent})
+
+    def save_async(self, settings, swatches):
+        self._worker.submit(self._save, dict(settings), list(swatches))
+
+    def _save(self, settings, swatches):
+        try:
+            db = self._conn()
+            with db:                                         # one transaction per save
+                db.executemany("INSERT OR REPLACE INTO settings VALUES (?, ?)", settings.items())
+                db.execute("DELETE FROM swatches")
+                db.executemany("INSERT INTO swatches VALUES (?, ?)", enumerate(swatches))
+        except sqlite3.Error as e:
+            self.signals.failed.emit(f"Session not saved: {e}")
+
+    def add_recent_image_async(self, path, thumb):
+        self._worker.submit(self._add_recent_image, path, thumb)
+
+    def _add_recent_image(self, path, thumb):
+        data = QByteArray()
+        buf = QBuffer(data)
+        buf.open(QIODevice.WriteOnly)
+        thumb.save(buf, "PNG")
+        buf.close()
+        try:
+            db = self._conn()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO recent_images VALUES (?, ?, ?)",
+                    (path, time.time(), sqlite3.Binary(data.data()))
+                )
+                db.execute(
+                    "DELETE FROM recent_images WHERE path NOT IN "
+                    "(SELECT path FROM recent_images ORDER BY opened DESC LIMIT ?)",
+                    (RECENT_IMAGE_LIMIT,)
+                )
+        except sqlite3.Error as e:
+            self.signals.failed.emit(f"Recent image not saved: {e}")
+
+    def close(self):                 # waits for the pending writes, the connection is closed on its own thread
+        self._worker.submit(self._close_db)
+        self._worker.shutdown(wait=True)
+
+    def _close_db(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+#########################################################################
+# Image analysis / pipette, contrast heatmap and screen capture
+
+HEATMAP_TILE = 32                    # px of the source image per heatmap cell
+HEATMAP_FLAT_RATIO = 1.05            # below this a tile is flat, just noise (faint #CCC on #EEE text is ~1.4 and has to count)
+HEATMAP_COLORS = [                   # (ratio below, RGBA) checked in order, tiles passing AAA stay clear
+    (3.0, (220, 40, 40, 150)),
+    (4.5, (240, 140, 30, 130)),
+    (7.0, (240, 220, 40, 90)),
+]
+LIVE_CAPTURE_INTERVAL_MS = 500
+
+def qimage_to_rgb_array(image):      # any QImage -> uint8 (h, w, 3), transparency composited over white
+    w, h = image.width(), image.height()
+    if image.hasAlphaChannel():
+        flat = QImage(w, h, QImage.Format_RGBX8888)
+        flat.fill(Qt.white)
+        painter = QPainter(flat)
+        painter.drawImage(0, 0, image)
+        painter.end()
+    else:
+        flat = image.convertToFormat(QImage.Format_RGBX8888)
+    rows = np.frombuffer(flat.constBits(), np.uint8, count=flat.sizeInBytes()).reshape(h, flat.bytesPerLine())
+    return rows[:, :w * 4].reshape(h, w, 4)[..., :3].copy()
+
+def rgb_array_hex(rgb, x, y):
+    r, g, b = (int(c) for c in rgb[y, x])
+    return f"#{r:02X}{g:02X}{b:02X}"
+
+
+class ContrastHeatmap:
+    """Local contrast per tile: the ratio between the lightest and the darkest pixel in it.
+
+    Keeps the previous frame, so update() with a new frame of the same size only
+    recomputes the tiles whose pixels changed.
+    """
+
+    def __init__(self, tile=HEATMAP_TILE):
+        self.tile = tile
+        self.frame = None            # padded copy of the last frame
+        self.size = None             # (w, h) of the unpadded frame
+        self.ratios = None           # float (tiles_y, tiles_x)
+
+    def tiles(self, frame):          # (h, w, 3) -> (tiles_y, tile, tiles_x, tile, 3) view, no copy
+        ty, tx = frame.shape[0] // self.tile, frame.shape[1] // self.tile
+        return frame.reshape(ty, self.tile, tx, self.tile, 3)
+
+    def update(self, rgb):           # returns how many tiles had to be re-analyzed
+        h, w = rgb.shape[:2]
+        pad_y, pad_x = -h % self.tile, -w % self.tile
+        frame = np.pad(rgb, ((0, pad_y), (0, pad_x), (0, 0)), mode="edge") if pad_y or pad_x else rgb
+        blocks = self.tiles(frame)
+
+        if self.frame is None or self.frame.shape != frame.shape:
+            changed = np.ones(blocks.shape[::2][:2], dtype=bool)
+            self.ratios = np.ones(changed.shape)
+        else:
+            changed = np.any(blocks != self.tiles(self.frame), axis=(1, 3, 4))   #cheap compare first, luminance only where something moved
+
+        ys, xs = np.nonzero(changed)
+        if len(ys) == changed.size:      # new frame, no need to gather the tiles first
+            lum = relative_luminance_u8_planes(blocks)                            # (tiles_y, tile, tiles_x, tile)
+            hi, lo = lum.max(axis=(1, 3)), lum.min(axis=(1, 3))
+            self.ratios = (hi + 0.05) / (lo + 0.05)
+        elif len(ys):
+            lum = relative_luminance_u8_planes(blocks[ys, :, xs])                # (changed tiles, tile, tile)
+            hi, lo = lum.max(axis=(1, 2)), lum.min(axis=(1, 2))
+            self.ratios[ys, xs] = (hi + 0.05) / (lo + 0.05)
+        self.frame = frame
+        self.size = (w, h)
+        return len(ys)
+
+    def counts(self):                # tiles with content below AA / all tiles with content
+        content = self.ratios >= HEATMAP_FLAT_RATIO
+        return int(np.count_nonzero(content & (self.ratios < 4.5))), int(np.count_nonzero(content))
+
+    def overlay(self):               # one pixel per tile, scale it up with FastTransformation to draw it
+        ty, tx = self.ratios.shape
+        rgba = np.zeros((ty, tx, 4), dtype=np.uint8)
+        assigned = self.ratios < HEATMAP_FLAT_RATIO
+        for limit, color in HEATMAP_COLORS:
+            hit = ~assigned & (self.ratios < limit)
+            rgba[hit] = color
+            assigned |= hit
+        return QImage(rgba.tobytes(), tx, ty, tx * 4, QImage.Format_RGBA8888).copy()
+
+
+def screen_grab_available():         # headless platforms have a screen object but nothing to grab from it
+    return QGuiApplication.primaryScreen() is not None and QGuiApplication.platformName() not in ("offscreen", "minimal")
+
+def grab_screen_region(rect, fallback_widget):        #rect in global coords, None = just the window
+    pixmap = QPixmap()
+    screen = QGuiApplication.screenAt(rect.center()) if rect is not None else None
+    if screen is not None and screen_grab_available():
+        geo = screen.geometry()
+        pixmap = screen.grabWindow(0, rect.x() - geo.x(), rect.y() - geo.y(), rect.width(), rect.height())
+    if pixmap.isNull():              # no region, headless or no screen access: use what the window itself renders
+        pixmap = fallback_widget.grab()
+    return pixmap.toImage()
+
+
+class RegionSelector(QWidget):
+    """Frozen full screen shot, drag a rectangle over it, Esc (or any other close) cancels."""
+
+    selected = Signal(QRect)         # global coords
+    cancelled = Signal()
+
+    def __init__(self, screen):
+        super().__init__(None, Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self.geo = screen.geometry()
+        self.shot = screen.grabWindow(0)
+        self.origin = None
+        self.result = None               # set right before closing, closeEvent emits it
+        self.finished = False
+        self.band = QRubberBand(QRubberBand.Rectangle, self)
+        self.setCursor(Qt.CrossCursor)
+        self.setGeometry(self.geo)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.drawPixmap(self.rect(), self.shot)
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 60))
+        painter.end()
+
+    def mousePressEvent(self, event):
+        self.origin = event.position().toPoint()
+        self.band.setGeometry(QRect(self.origin, self.origin))
+        self.band.show()
+
+    def mouseMoveEvent(self, event):
+        if self.origin is not None:
+            self.band.setGeometry(QRect(self.origin, event.position().toPoint()).normalized())
+
+    def mouseReleaseEvent(self, event):
+        rect = self.band.geometry()
+        if rect.width() >= 4 and rect.height() >= 4:
+            self.result = rect.translated(self.geo.topLeft())
+        self.close()
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Escape:
+            self.close()
+
+    def closeEvent(self, event):         #every way out ends here (window manager too), so the hidden main window always comes back
+        super().closeEvent(event)
+        if self.finished:
+            return
+        self.finished = True
+        if self.result is None:
+            self.cancelled.emit()
+        else:
+            self.selected.emit(self.result)
+
+
+#########################################################################
+# Image viewer / zoom + pan, mipmap pyramid built in the background, painted tile by tile
+
+PYRAMID_TILE = 256                   # px per painted tile, in the coords of its pyramid level
+PYRAMID_MIN_SIZE = 256               # stop halving once the image fits in this
+TILE_CACHE_KB = 64 * 1024            # QPixmapCache budget for converted tiles
+VIEWER_MAX_ZOOM = 64.0               # scene px -> screen px, enough to see single pixels as blocks
+
+_pyramid_pool = None
+
+def pyramid_pool():                  # one worker, a new image just makes the old build stale
+    global _pyramid_pool
+    if _pyramid_pool is None:
+        _pyramid_pool = ThreadPoolExecutor(max_workers=1)
+    return _pyramid_pool
+
+def build_image_pyramid(image, is_current=lambda: True):       # [full, 1/2, 1/4, ...] QImages, QImage is fine off the UI thread
+    levels = [image]
+    while max(levels[-1].width(), levels[-1].height()) > PYRAMID_MIN_SIZE and is_current():
+        prev = levels[-1]
+        levels.append(prev.scaled(max(1, prev.width() // 2), max(1, prev.height() // 2),
+                                  Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+    return levels
+
+
+class PyramidSignals(QObject):        # pool thread -> UI thread
+    built = Signal(int, object)          # generation, levels
+
+
+class TiledImageItem(QGraphicsItem):
+    """The image in scene coords = full resolution pixels.
+
+    paint() picks the pyramid level that matches the zoom and only draws the
+    tiles inside the exposed rect, each converted to a QPixmap once.
+    """
+
+    def __init__(self, image, generation):
+        super().__init__()
+        self.levels = [image]            # until the pyramid arrives only the full image is there
+        self.generation = generation
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)       # for option.exposedRect
+
+    def set_levels(self, levels):
+        self.levels = levels
+        self.update()
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.levels[0].width(), self.levels[0].height())
+
+    def tile_pixmap(self, level, tx, ty):
+        key = f"pyr:{self.generation}:{level}:{tx}:{ty}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = QPixmap.fromImage(self.levels[level].copy(tx * PYRAMID_TILE, ty * PYRAMID_TILE, PYRAMID_TILE, PYRAMID_TILE))
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    def paint(self, painter, option, widget=None):
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        level = 0
+        while level + 1 < len(self.levels) and lod * 2 ** (level + 1) <= 1.0:      # coarsest level that still has >= 1 px per screen px
+            level += 1
+        scale = 2 ** level
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, lod < 1.0)          # zoomed in = hard pixel edges, for inspecting
+        exposed = option.exposedRect.intersected(self.boundingRect())
+        img = self.levels[level]
+        span = PYRAMID_TILE * scale
+        x0, y0 = int(exposed.left() // span), int(exposed.top() // span)
+        x1 = min(int(exposed.right() // span), (img.width() - 1) // PYRAMID_TILE)
+        y1 = min(int(exposed.bottom() // span), (img.height() - 1) // PYRAMID_TILE)
+        for ty in range(y0, y1 + 1):
+            for tx in range(x0, x1 + 1):
+                pixmap = self.tile_pixmap(level, tx, ty)
+                target = QRectF(tx * span, ty * span, pixmap.width() * scale, pixmap.height() * scale)
+                painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+
+
+class ImageViewer(QGraphicsView):
+    """Wheel zooms around the cursor, drag pans, a click samples the pixel under it."""
+
+    sampled = Signal(int, int, object)   # x, y in image pixels, mouse button
+
+    def __init__(self, message):
+        super().__init__()
+        self.setScene(QGraphicsScene(self))
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState)
+        self.setBackgroundBrush(QColor(128, 128, 128, 40))
+        self.image_item = None
+        self.overlay_item = None
+        self.message = message
+        self.generation = 0
+        self.press_pos = None
+        self.pending_sample = None           # (x, y, button), sent once it is clear the click is not half a double click
+        self.sample_timer = QTimer(self)
+        self.sample_timer.setSingleShot(True)
+        self.sample_timer.setInterval(QGuiApplication.styleHints().mouseDoubleClickInterval())
+        self.sample_timer.timeout.connect(self.emit_pending_sample)
+        self.signals = PyramidSignals()
+        self.signals.built.connect(self.on_pyramid_built)
+
+    def set_message(self, text):
+        self.message = text
+        self.viewport().update()
+
+    def set_image(self, image):          # same size as before keeps zoom and scroll (live capture)
+        self.generation += 1
+        keep_view = self.image_item is not None and self.image_item.boundingRect().size() == QSizeF(image.size())
+        if self.image_item is not None:
+            self.scene().removeItem(self.image_item)
+        self.image_item = TiledImageItem(image, self.generation)
+        self.scene().addItem(self.image_item)
+        self.scene().setSceneRect(self.image_item.boundingRect())
+        self.message = ""
+        if not keep_view:
+            self.fit_image()
+        generation = self.generation
+        future = pyramid_pool().submit(build_image_pyramid, image, lambda: generation == self.generation)
+        future.add_done_callback(lambda f: self.signals.built.emit(generation, f.result()))
+
+    def on_pyramid_built(self, generation, levels):
+        if generation == self.generation and self.image_item is not None:
+            self.image_item.set_levels(levels)
+
+    def set_overlay(self, overlay, tile):        # heatmap, one pixel per tile, None hides it
+        if self.overlay_item is not None:
+            self.scene().removeItem(self.overlay_item)
+            self.overlay_item = None
+        if overlay is not None:
+            self.overlay_item = self.scene().addPixmap(QPixmap.fromImage(overlay))
+            self.overlay_item.setTransformationMode(Qt.FastTransformation)
+            self.overlay_item.setTransform(QTransform.fromScale(tile, tile))
+            self.overlay_item.setZValue(1)
+
+    def fit_image(self):
+        if self.image_item is not None:
+            self.fitInView(self.image_item.boundingRect(), Qt.KeepAspectRatio)
+
+    def wheelEvent(self, event):
+        factor = 1.25 if event.angleDelta().y() > 0 else 0.8
+        zoom = self.transform().m11() * factor
+        if self.image_item is None or zoom > VIEWER_MAX_ZOOM:
+            return
+        rect = self.image_item.boundingRect()
+        if factor < 1 and rect.width() * zoom < 64 and rect.height() * zoom < 64:
+            return
+        self.scale(factor, factor)
+
+    def mouseDoubleClickEvent(self, event):
+        self.sample_timer.stop()             # neither click of a double click samples
+        self.pending_sample = None
+        self.press_pos = None                # and the release after this is not a click either
+        self.fit_image()
+
+    def mousePressEvent(self, event):
+        self.press_pos = event.position().toPoint()
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        pos = event.position().toPoint()
+        if self.image_item is None or self.press_pos is None or (pos - self.press_pos).manhattanLength() > 3:
+            return                       # that was a pan
+        scene_pos = self.mapToScene(pos)
+        x, y = math.floor(scene_pos.x()), math.floor(scene_pos.y())
+        size = self.image_item.levels[0].size()
+        if 0 <= x < size.width() and 0 <= y < size.height():
+            self.pending_sample = (x, y, event.button())
+            self.sample_timer.start()
+
+    def emit_pending_sample(self):
+        if self.pending_sample is not None:
+            self.sampled.emit(*self.pending_sample)
+            self.pending_sample = None
+
+    def drawForeground(self, painter, rect):
+        if self.message:
+            painter.resetTransform()
+            painter.drawText(self.viewport().rect(), Qt.AlignCenter, self.message)
+
+
+#########################################################################
+# Documents / PDF pages and SVG files rasterized in a pool, analyzed like images
+
+DOCUMENT_DPI = 150
+DOCUMENT_MAX_SIDE = 6000             # px, a poster-size page at a high dpi gets scaled down to this (~140 MB as ARGB32)
+DOCUMENT_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+DOCUMENT_PAGE_WINDOW = DOCUMENT_WORKERS * 2          # pages rasterized or analyzed at the same time, the rest waits...
+DOCUMENT_PIXEL_BUDGET = 48_000_000   # ...and their pixels together stay under this, a page bigger than it runs alone
+REPORT_THUMBNAIL_SIZE = 240
+
+_document_pool = None
+_document_local = threading.local()  # each pool thread keeps its own open QPdfDocument, only pool threads call rasterize_page
+
+def document_pool():
+    global _document_pool
+    if _document_pool is None:
+        _document_pool = ThreadPoolExecutor(max_workers=DOCUMENT_WORKERS)
+    return _document_pool
+
+def thread_pdf_document(path):       # loading parses the whole file, so reuse it for every page of the same pdf on this thread
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)       # a re-exported file is a new document
+    cached = getattr(_document_local, "pdf", None)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    drop_thread_pdf_document()
+    from PySide6.QtPdf import QPdfDocument
+    doc = QPdfDocument()
+    if doc.load(path) != QPdfDocument.Error.None_:
+        raise ValueError(f"Could not open {os.path.basename(path)}")
+    _document_local.pdf = (key, doc)
+    return doc
+
+def drop_thread_pdf_document():
+    cached = getattr(_document_local, "pdf", None)
+    _document_local.pdf = None
+    if cached is not None:
+        cached[1].close()
+
+def release_pdf_documents():         # after an audit, every pool thread closes its pdf, nothing stays parsed in memory
+    if _document_pool is None:
+        return
+    barrier = threading.Barrier(DOCUMENT_WORKERS)
+
+    def release():                   #the barrier keeps each task on its own thread, so every thread gets one
+        drop_thread_pdf_document()
+        try:
+            barrier.wait(timeout=5.0)
+        except threading.BrokenBarrierError:
+            pass
+    for _ in range(DOCUMENT_WORKERS):
+        _document_pool.submit(release)
+
+def document_pages(path):            # -> [(path, page index, (width, height) in points or None)], an svg is one page
+    if path.lower().endswith(".svg"):
+        return [(path, 0, None)]         # size unknown until it is parsed on the pool
+    from PySide6.QtPdf import QPdfDocument
+    doc = QPdfDocument()
+    if doc.load(path) != QPdfDocument.Error.None_:
+        raise ValueError(f"Could not open {os.path.basename(path)}")
+    pages = []
+    for i in range(doc.pageCount()):
+        points = doc.pagePointSize(i)
+        pages.append((path, i, (points.width(), points.height())))
+    doc.close()
+    return pages
+
+def raster_size(width, height, scale):                 # points or svg px * scale, capped
+    w, h = width * scale, height * scale
+    fit = min(1.0, DOCUMENT_MAX_SIDE / max(w, h, 1.0))
+    return QSize(max(1, round(w * fit)), max(1, round(h * fit)))
+
+def page_pixels(points, dpi):        # what a page will cost once rasterized, unknown sizes count as the biggest page
+    if points is None:
+        return DOCUMENT_MAX_SIDE * DOCUMENT_MAX_SIDE
+    size = raster_size(points[0], points[1], dpi / 72.0)
+    return size.width() * size.height()
+
+def rasterize_page(path, page, dpi):                   # -> QImage, runs on a pool thread
+    if path.lower().endswith(".svg"):
+        from PySide6.QtSvg import QSvgRenderer
+        renderer = QSvgRenderer(path)
+        if not renderer.isValid():
+            raise ValueError(f"Could not open {os.path.basename(path)}")
+        size = raster_size(renderer.defaultSize().width(), renderer.defaultSize().height(), dpi / 96.0)   # svg px are 1/96 in
+        image = QImage(size, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        renderer.render(painter)
+        painter.end()
+        return image
+    doc = thread_pdf_document(path)
+    points = doc.pagePointSize(page)
+    return doc.render(page, raster_size(points.width(), points.height(), dpi / 72.0))
+
+def heatmap_thumbnail(image, heatmap, size=REPORT_THUMBNAIL_SIZE):       # small copy with the heatmap painted over it
+    thumb = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    flat = QImage(thumb.size(), QImage.Format_RGB32)
+    flat.fill(Qt.white)                  # transparent svg areas
+    painter = QPainter(flat)
+    painter.drawImage(0, 0, thumb)
+    scale = thumb.width() / heatmap.size[0]
+    overlay = heatmap.overlay()
+    painter.drawImage(QRectF(0, 0, overlay.width() * heatmap.tile * scale, overlay.height() * heatmap.tile * scale), overlay)
+    painter.end()
+    return flat
+
+def analyze_document_page(path, page, dpi):            #rasterize + heatmap on a pool thread, only the numbers and a thumbnail come back
+    image = rasterize_page(path, page, dpi)
+    if image.isNull():
+        raise ValueError(f"Page {page + 1} could not be rendered")
+    heatmap = ContrastHeatmap()
+    heatmap.update(qimage_to_rgb_array(image))
+    failing, content = heatmap.counts()
+    with_content = heatmap.ratios[heatmap.ratios >= HEATMAP_FLAT_RATIO]
+    return {
+        "file": os.path.basename(path),
+        "path": path,
+        "page": page + 1,
+        "width": image.width(),
+        "height": image.height(),
+        "tiles_below_aa": failing,
+        "tiles_with_content": content,
+        "worst_ratio": float(with_content.min()) if with_content.size else None,
+        "thumbnail": heatmap_thumbnail(image, heatmap),
+    }
+
+DOCUMENT_ERRORS_SHOWN = 5            # lines under the status, the tooltip has all of them
+
+def export_document_report(rows, dpi, path, errors=()):          # per page json, thumbnails stay in the app
+    import json
+    pages = [{k: v for k, v in row.items() if k != "thumbnail"} for row in rows]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"tool": "ColorContrast", "dpi": dpi, "pages": pages, "errors": list(errors)}, f, indent=1)
+
+
+class DocumentSignals(QObject):       # pool threads -> UI thread
+    page_done = Signal(int, int, object)     # job, index in the page list, row dict or error text
+    page_rendered = Signal(int, object)      # open request, QImage or error text
+
+
+class DocumentAudit:
+    """Feeds pages to the pool, at most DOCUMENT_PAGE_WINDOW at a time and
+    DOCUMENT_PIXEL_BUDGET pixels between them.
+
+    A page image only lives while its task runs, so memory depends on the
+    window, not on the page count.
+    """
+
+    def __init__(self, job, pages, dpi, signals):
+        self.job = job
+        self.pages = pages
+        self.dpi = dpi
+        self.signals = signals
+        self.next_index = 0
+        self.in_flight = 0
+        self.in_flight_pixels = 0
+        self.done = 0
+
+    def fill(self):                  # call again after every finished page
+        while self.in_flight < DOCUMENT_PAGE_WINDOW and self.next_index < len(self.pages):
+            index = self.next_index
+            path, page, points = self.pages[index]
+            pixels = page_pixels(points, self.dpi)
+            if self.in_flight and self.in_flight_pixels + pixels > DOCUMENT_PIXEL_BUDGET:
+                break
+            self.next_index += 1
+            self.in_flight += 1
+            self.in_flight_pixels += pixels
+            future = document_pool().submit(analyze_document_page, path, page, self.dpi)
+            future.add_done_callback(lambda f, index=index: self.signals.page_done.emit(
+                self.job, index, f.result() if f.exception() is None else str(f.exception())
+            ))
+
+    def finish_page(self, index):
+        path, page, points = self.pages[index]
+        self.in_flight -= 1
+        self.in_flight_pixels -= page_pixels(points, self.dpi)
+        self.done += 1
+        self.fill()
+        return self.done == len(self.pages)
+
+
+#########################################################################
+# Reports / current pair, worksheet, palette and heatmaps as HTML or PDF, written off the UI thread
+
+REPORT_JPEG_QUALITY = 80             # heatmap thumbnails, embedded
+REPORT_PDF_DPI = 300
+REPORT_COLORS = RESULT_THEME_COLORS[False]           # reports are always light
+
+_report_pool = None
+
+def report_pool():                   # a QThreadPool, QTextDocument layout needs a thread with a Qt event dispatcher
+    global _report_pool
+    if _report_pool is None:
+        _report_pool = QThreadPool()
+        _report_pool.setMaxThreadCount(1)
+    return _report_pool
+
+def encode_report_image(image):      # -> jpeg bytes
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.convertToFormat(QImage.Format_RGB32).save(buffer, "JPEG", REPORT_JPEG_QUALITY)
+    buffer.close()
+    return bytes(data)
+
+def report_status_cell(status):
+    color = REPORT_COLORS["pass"] if status == "Pass" else REPORT_COLORS["fail"]
+    return f'<td><span style="color:{color}; font-weight:bold;">{status}</span></td>'
+
+def report_swatch(hex_color):
+    return f'<td bgcolor="{hex_color[:7]}" width="24">&nbsp;</td><td>{html.escape(hex_color)}</td>'
+
+REPORT_CSS = (
+    "body { font-family: sans-serif; color: #222; } table { border-collapse: collapse; margin-bottom: 12px; }"
+    " td, th { border: 1px solid #bbb; padding: 3px 6px; } th { background: #eee; } h2 { margin-top: 18px; }"
+)
+REPORT_TABLE_ROWS = 100              # big tables are split, each block is one setHtml/insertHtml call
+
+def report_blocks(snapshot, image_src):           # -> ([html blocks], [images]), image_src(index, QImage) -> what goes in <img src>
+    blocks = [f"<h1>Contrast report</h1><p>{html.escape(snapshot['created'])}</p>"]
+    images = []
+
+    def img(image, title):
+        images.append(image)
+        return f'<img src="{image_src(len(images) - 1, image)}" width="{image.width()}" height="{image.height()}" alt="{html.escape(title)}">'
+
+    def tables(header, rows):        # rows split into tables of REPORT_TABLE_ROWS, the header repeats in each
+        for start in range(0, len(rows), REPORT_TABLE_ROWS):
+            blocks.append("<table>" + header + "".join(rows[start:start + REPORT_TABLE_ROWS]) + "</table>")
+
+    pair = snapshot.get("pair")
+    if pair is not None:
+        fg, bg, ratio, criteria, detail = pair
+        rows = [
+            f"<tr><th>Foreground</th>{report_swatch(fg)}</tr><tr><th>Background</th>{report_swatch(bg)}</tr>",
+            f"<tr><th>Contrast ratio</th><td colspan='2'>{ratio:.2f}</td></tr>",
+        ]
+        if detail:
+            rows.append(f"<tr><th>Detail</th><td colspan='2'>{html.escape(detail)}</td></tr>")
+        blocks.append("<h2>Current pair</h2><table>" + "".join(rows) + "</table>")
+        tables("<tr><th>Criterion</th><th>Applies to</th><th>Result</th></tr>", [
+            f"<tr><td>{html.escape(crit['title'])}</td><td>{html.escape(crit['label'])}</td>{report_status_cell(crit['status'])}</tr>"
+            for crit in criteria
+        ])
+
+    entries = snapshot.get("worksheet") or []
+    if entries:
+        failing = sum(1 for e in entries if "Fail" in e["results"].values())
+        blocks.append(f"<h2>Worksheet</h2><p>{len(entries)} pairs, {failing} fail at least one level.</p>")
+        header = ("<tr><th>Name</th><th colspan='2'>Foreground</th><th colspan='2'>Background</th><th>Ratio</th>"
+                  + "".join(f"<th>{html.escape(k)}</th>" for k in entries[0]["results"]) + "</tr>")
+        tables(header, [
+            f"<tr><td>{html.escape(e['name'])}</td>{report_swatch(e['foreground'])}{report_swatch(e['background'])}"
+            f"<td>{e['ratio']:.2f}</td>" + "".join(report_status_cell(s) for s in e["results"].values()) + "</tr>"
+            for e in entries
+        ])
+
+    palette = snapshot.get("palette")
+    if palette is not None:
+        bg, level, palette_rows = palette
+        blocks.append(f"<h2>Palette</h2><p>Every shade reaches {PALETTE_LEVELS[level]} ({html.escape(level)}) on {html.escape(bg)}.</p>")
+        tables("", [
+            f"<tr><th>{round(hue * 360)}°</th>" + "".join(
+                f'<td bgcolor="{hex_color}" style="white-space: nowrap; color:{"#000000" if hex_luminance(hex_color) > 0.18 else "#FFFFFF"};">'
+                f"{hex_color}<br>{ratio:.2f}</td>"
+                for hex_color, ratio in shades
+            ) + "</tr>"
+            for hue, shades in palette_rows
+        ])
+
+    heatmaps = snapshot.get("heatmaps") or []
+    if heatmaps:
+        blocks.append("<h2>Image heatmaps</h2><p>Marked tiles: below AAA (yellow), AA (orange), AA Large (red).</p>")
+        tables("", [
+            f"<tr><td>{img(thumb, title)}</td><td><b>{html.escape(title)}</b><br>{html.escape(summary)}</td></tr>"
+            for title, thumb, summary in heatmaps
+        ])
+    return blocks, images
+
+def write_report(snapshot, path):    # runs on the report pool
+    snapshot = dict(snapshot)
+    snapshot["heatmaps"] = [
+        (title, heatmap_thumbnail(image, heatmap) if heatmap is not None else image, summary)
+        for title, image, heatmap, summary in snapshot.get("heatmaps", [])
+    ]
+    if path.lower().endswith(".pdf"):
+        from PySide6.QtGui import QTextDocument, QTextCursor, QPdfWriter, QPageSize
+        target = QFile(path)                 # opened here, QPdfWriter(path) only logs a warning when it can't write
+        if not target.open(QIODevice.WriteOnly):
+            raise OSError(target.errorString())
+        document = QTextDocument()
+        document.setDefaultStyleSheet(REPORT_CSS)
+        blocks, images = report_blocks(snapshot, lambda i, image: f"report-image-{i}.jpg")
+        for i, image in enumerate(images):           # compressed the same way as in the html
+            document.addResource(QTextDocument.ImageResource, QUrl(f"report-image-{i}.jpg"),
+                                 QImage.fromData(encode_report_image(image), "JPEG"))
+        cursor = QTextCursor(document)
+        for i, block in enumerate(blocks):           #one big setHtml holds the GIL the whole parse and the UI thread stalls, small blocks dont
+            cursor.movePosition(QTextCursor.End)
+            if i:
+                cursor.insertBlock()                 # otherwise the block gets merged into the last paragraph
+            cursor.insertHtml(block)
+        writer = QPdfWriter(target)
+        writer.setPageSize(QPageSize(QPageSize.A4))
+        writer.setResolution(REPORT_PDF_DPI)
+        writer.setTitle("Contrast report")
+        document.print_(writer)
+        del writer                           # finishes the pdf before the file is closed
+        written, error = target.size(), target.error()
+        target.close()
+        if error != QFileDevice.NoError or written == 0:
+            raise OSError(target.errorString() or f"Nothing was written to {path}")
+        return
+    import base64
+    blocks, _ = report_blocks(snapshot, lambda i, image: "data:image/jpeg;base64," + base64.b64encode(encode_report_image(image)).decode("ascii"))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"<html><head><meta charset='utf-8'><title>Contrast report</title><style>{REPORT_CSS}</style></head><body>")
+        f.writelines(blocks)
+        f.write("</body></html>")
+
+
+class ReportSignals(QObject):         # report pool -> UI thread
+    finished = Signal(str, str)          # path, error text ("" when it worked)
+
 
 #########################################################################
 # Main widget
 
 class ContrastCheckerWidget(QWidget):
-    
-    def __init__(self):
+    first_painted = Signal(float)        # cold start ms, once
+
+    def __init__(self, session_store=None):
         super().__init__()
         self.setWindowTitle("ColorContrast")
 
+        self.session_store = session_store          # None = nothing gets saved
+        self.restoring_session = session_store is not None      # no saves until the stored session is applied, they would overwrite it with the defaults
+        self.cold_start_ms = None
+        self.first_paint_pending = False
+        self.save_timer = QTimer(self)               #wait until the user stops moving the slider before saving
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(400)
+        self.save_timer.timeout.connect(self.save_session)
+
         
         self.custom_colors = []          #it will store to 16 custom colors
 
         
         self.last_ratio = None               #it will track the lastest ratio for it to generate recommendatonin
+        self.last_result = None              # what the result card shows, so it can be redrawn
+        self.last_pair = None                # (fg, bg) the last result was calculated for, for the report
+        self.last_theme_switch_ms = None
 
         self.fg_h = 0.0
         self.fg_s = 1.0
@@ -225,7 +2155,11 @@ class ContrastCheckerWidget(QWidget):
         self.bg_v = 1.0
         self.bg_a = 1.0
 
+        self.fg_hex = None                   # OKLCH/CIELAB: the exact hex, the HSV state above truncates and would drift it
+        self.bg_hex = None
+
         self.is_dark_mode = False
+        self.color_mode = "HSV"              # what the hue/sat/bri sliders mean, see COLOR_MODES
 
         ##################################################################
         # FG Input
@@ -282,6 +2216,8 @@ class ContrastCheckerWidget(QWidget):
         fg_form.addRow("Brightness", bri_layout_fg)
         fg_form.addRow("Opacity", opa_layout_fg)
         self.fg_tab.setLayout(fg_form)
+        self.slider_names_fg = [fg_form.labelForField(l) for l in (hue_layout_fg, sat_layout_fg, bri_layout_fg)]      # renamed when the color mode changes
+        self.slider_helps_fg = [hue_help_fg, sat_help_fg, bri_help_fg]
 
         #####################################################################
         # BACKGROUND INPUT
@@ -338,6 +2274,8 @@ class ContrastCheckerWidget(QWidget):
         bg_form.addRow("Brightness", bri_layout_bg)
         bg_form.addRow("Opacity", opa_layout_bg)
         self.bg_tab.setLayout(bg_form)
+        self.slider_names_bg = [bg_form.labelForField(l) for l in (hue_layout_bg, sat_layout_bg, bri_layout_bg)]
+        self.slider_helps_bg = [hue_help_bg, sat_help_bg, bri_help_bg]
 
         #######################################################################
         # TAB widget
@@ -345,6 +2283,7 @@ class ContrastCheckerWidget(QWidget):
         self.tab_widget = QTabWidget()                    # que aparezca en la app
         self.tab_widget.addTab(self.fg_tab, "Foreground")
         self.tab_widget.addTab(self.bg_tab, "Background")
+        self.tab_widget.addTab(self.build_gradient_tab(), "Gradient")
 
         #########################################################################
         # Preview area
@@ -359,25 +2298,83 @@ class ContrastCheckerWidget(QWidget):
         self.preview_text_input = QLineEdit("Sample Text")
         self.preview_text_input.textChanged.connect(self.update_preview)          #it connects so it can update if there is any change
 
+        self.font_size_spin = QSpinBox()                  # point size + weight, so we know if its "large text"
+        self.font_size_spin.setRange(8, 72)
+        self.font_size_spin.setValue(14)
+        self.font_size_spin.setSuffix(" pt")
+        self.font_size_spin.valueChanged.connect(self.update_preview)
+
+        self.bold_check = QCheckBox("Bold")
+        self.bold_check.toggled.connect(self.update_preview)
+
+        self.rendered_label = QLabel("")                  # contrast measured on the rasterized text
+
         self.preview_group = QGroupBox("Preview")
         preview_layout = QVBoxLayout()
         preview_layout.addWidget(self.preview_label)
+        preview_layout.addWidget(self.rendered_label)
         self.preview_group.setLayout(preview_layout)
 
         ############################################################################
         # Upload image
         
         self.upload_image_group = QGroupBox("Upload Image")               #todo lo que es upload image, mensaje de error, center text, making sure its clickeable
-        self.upload_image_label = QLabel("No image uploaded")
-        self.upload_image_label.setAlignment(Qt.AlignCenter)
-        self.upload_image_label.setStyleSheet("border: 1px solid #ccc;")
-        self.upload_image_label.setFixedSize(300, 250)
+        self.image_viewer = ImageViewer("No image uploaded")      # left click = foreground, right click = background
+        self.image_viewer.setMinimumSize(300, 250)
+        self.image_viewer.setToolTip("Wheel: zoom · Drag: pan · Double click: fit\nLeft click: pick foreground\nRight click: pick background")
+        self.image_viewer.sampled.connect(self.sample_image_pixel)
+        QPixmapCache.setCacheLimit(TILE_CACHE_KB)
         self.upload_image_button = QPushButton("Upload Image")
         self.upload_image_button.clicked.connect(self.upload_image)
 
+        self.source_image = None                            # full resolution QImage behind the preview
+        self.source_rgb = None                              # same as uint8 (h, w, 3), what the pipette reads
+        self.heatmap = ContrastHeatmap()
+        self.capture_rect = None                            # screen region for live capture, None = own window (headless only, see update_live_check)
+        self.region_selector = None
+
+        self.capture_button = QPushButton("Capture Screen")
+        self.capture_button.clicked.connect(self.capture_screen)
+        self.heatmap_check = QCheckBox("Heatmap")
+        self.heatmap_check.setToolTip("Tiles where the lightest and darkest pixel\nare below AAA (yellow), AA (orange) or AA Large (red)")
+        self.heatmap_check.toggled.connect(self.refresh_image_display)
+        self.live_check = QCheckBox("Live")
+        self.live_check.toggled.connect(self.set_live_capture)
+        self.live_interval_spin = QSpinBox()
+        self.live_interval_spin.setRange(100, 10000)
+        self.live_interval_spin.setSingleStep(100)
+        self.live_interval_spin.setSuffix(" ms")
+        self.live_interval_spin.setValue(LIVE_CAPTURE_INTERVAL_MS)
+        self.live_interval_spin.valueChanged.connect(lambda ms: self.live_timer.setInterval(ms))
+        self.live_timer = QTimer(self)
+        self.live_timer.setInterval(LIVE_CAPTURE_INTERVAL_MS)
+        self.live_timer.timeout.connect(self.capture_live_frame)
+        self.update_live_check()
+        self.image_info_label = QLabel("")
+
+        self.recent_images_menu = QMenu(self)               # filled from the session store
+        self.recent_images_btn = QToolButton()
+        self.recent_images_btn.setText("Recent")
+        self.recent_images_btn.setPopupMode(QToolButton.InstantPopup)
+        self.recent_images_btn.setMenu(self.recent_images_menu)
+        self.recent_images_btn.setEnabled(False)
+        self.recent_images = []                             # [(path, thumbnail QImage)], newest first
+
+        upload_buttons_layout = QHBoxLayout()
+        upload_buttons_layout.addWidget(self.upload_image_button, 1)
+        upload_buttons_layout.addWidget(self.recent_images_btn)
+
+        capture_layout = QHBoxLayout()
+        capture_layout.addWidget(self.capture_button, 1)
+        capture_layout.addWidget(self.live_check)
+        capture_layout.addWidget(self.live_interval_spin)
+        capture_layout.addWidget(self.heatmap_check)
+
         upload_image_layout = QVBoxLayout()
-        upload_image_layout.addWidget(self.upload_image_label)
-        upload_image_layout.addWidget(self.upload_image_button)
+        upload_image_layout.addWidget(self.image_viewer, 1)
+        upload_image_layout.addWidget(self.image_info_label)
+        upload_image_layout.addLayout(upload_buttons_layout)
+        upload_image_layout.addLayout(capture_layout)
         self.upload_image_group.setLayout(upload_image_layout)
 
         #########################################################################
@@ -398,7 +2395,18 @@ class ContrastCheckerWidget(QWidget):
         self.preview_group.setMinimumWidth(350)
         self.preview_group.setMinimumHeight(250)
 
-        middle_layout.addWidget(self.tab_widget, 1)
+        self.color_mode_combo = QComboBox()               # HSV / OKLCH / CIELAB sliders
+        self.color_mode_combo.addItems(COLOR_MODES)
+        self.color_mode_combo.currentTextChanged.connect(self.set_color_mode)
+
+        color_mode_layout = QHBoxLayout()
+        color_mode_layout.addWidget(QLabel("Sliders:"))
+        color_mode_layout.addWidget(self.color_mode_combo, 1)
+
+        sliders_layout = QVBoxLayout()
+        sliders_layout.addLayout(color_mode_layout)
+        sliders_layout.addWidget(self.tab_widget)
+        middle_layout.addLayout(sliders_layout, 1)
         middle_layout.addWidget(self.preview_group, 2)
 
         right_side_layout = QVBoxLayout()
@@ -412,6 +2420,9 @@ class ContrastCheckerWidget(QWidget):
         text_input_layout = QHBoxLayout()
         text_input_layout.addWidget(QLabel("Preview text:"))
         text_input_layout.addWidget(self.preview_text_input)
+        text_input_layout.addWidget(QLabel("Size:"))
+        text_input_layout.addWidget(self.font_size_spin)
+        text_input_layout.addWidget(self.bold_check)
 
         ###################################################################
         # Bottom layout (Calc Contrast + Recommendation + Theme)
@@ -420,8 +2431,8 @@ class ContrastCheckerWidget(QWidget):
         self.calculate_button.setFixedSize(130, 36)
         self.calculate_button.clicked.connect(self.calculate_wcw_contrast)
 
-        self.result_label = QLabel("Result will appear here")
-        self.result_label.setFixedWidth(300)
+        self.result_card = ResultCard()
+        self.result_card.setMinimumWidth(360)
 
         self.toggle_theme_btn = QPushButton("Dark Mode")
         self.toggle_theme_btn.setFixedSize(90, 28)
@@ -431,30 +2442,537 @@ class ContrastCheckerWidget(QWidget):
         self.recommendation_button.setFixedSize(130, 36)
         self.recommendation_button.clicked.connect(self.handle_recommendation)
 
+        self.report_button = QPushButton("Save Report…")              # html or pdf with everything calculated so far
+        self.report_button.setFixedSize(130, 36)
+        self.report_button.clicked.connect(self.save_report)
+        self.report_signals = ReportSignals(self)
+        self.report_signals.finished.connect(self.on_report_finished)
+
         buttons_layout = QVBoxLayout()
         buttons_layout.addWidget(self.calculate_button)
         buttons_layout.addWidget(self.recommendation_button)
+        buttons_layout.addWidget(self.report_button)
 
         bottom_layout = QHBoxLayout()
         bottom_layout.addLayout(buttons_layout)
-        bottom_layout.addWidget(self.result_label)
+        bottom_layout.addWidget(self.result_card)
         bottom_layout.addWidget(self.toggle_theme_btn)
 
         ######################################################################
         # Main layout
         
+        single_layout = QVBoxLayout()
+        single_layout.addLayout(top_layout)
+        single_layout.addLayout(middle_layout)
+        single_layout.addLayout(text_input_layout)
+        single_layout.addLayout(bottom_layout)
+        self.single_page = QWidget()
+        self.single_page.setLayout(single_layout)
+
+        self.main_tabs = QTabWidget()                      # one pair on the first tab, the whole worksheet on the second
+        self.main_tabs.addTab(self.single_page, "Single Pair")
+        self.main_tabs.addTab(self.build_worksheet_tab(), "Worksheet")
+        self.main_tabs.addTab(self.build_palette_tab(), "Palette")
+        self.main_tabs.addTab(self.build_documents_tab(), "Documents")
+
+        self.session_status = QLabel("")            # only shown when the session could not be restored or saved
+        self.session_status.setWordWrap(True)
+        self.session_status.hide()
+
         main_layout = QVBoxLayout()
-        main_layout.addLayout(top_layout)
-        main_layout.addLayout(middle_layout)
-        main_layout.addLayout(text_input_layout)
-        main_layout.addLayout(bottom_layout)
+        main_layout.addWidget(self.main_tabs)
+        main_layout.addWidget(self.session_status)
         self.setLayout(main_layout)
 
         
+        self.apply_theme(False)        # light theme by default
+
         self.on_fg_input_changed()     #Initialize from defaults
         self.on_bg_input_changed()
         self.update_preview()
 
+    ########################################
+    # Gradient tab
+
+    def build_gradient_tab(self):
+        self.gradient_check = QCheckBox("Use gradient background")
+        self.gradient_check.toggled.connect(self.update_preview)
+
+        self.gradient_kind = QComboBox()
+        self.gradient_kind.addItems(GRADIENT_KINDS)
+        self.gradient_kind.currentIndexChanged.connect(self.update_preview)
+
+        self.gradient_angle = QSpinBox()
+        self.gradient_angle.setRange(0, 359)
+        self.gradient_angle.setValue(90)
+        self.gradient_angle.setSuffix("°")
+        self.gradient_angle.setWrapping(True)
+        self.gradient_angle.valueChanged.connect(self.update_preview)
+
+        self.gradient_stops_input = QLineEdit("#FFFFFF 0%, #1E3A8A 100%")
+        self.gradient_stops_input.textChanged.connect(self.update_preview)       #live while typing
+
+        stops_help = self.create_help_button("Stops: hex + position.\n#RRGGBB[AA] 0..100%, comma separated.\nAlpha goes in the hex.")
+        stops_layout = QHBoxLayout()
+        stops_layout.addWidget(self.gradient_stops_input)
+        stops_layout.addWidget(stops_help)
+
+        self.gradient_result_label = QLabel("")
+        self.gradient_result_label.setWordWrap(True)
+
+        form = QFormLayout()
+        form.addRow(self.gradient_check)
+        form.addRow("Type", self.gradient_kind)
+        form.addRow("Angle", self.gradient_angle)
+        form.addRow("Stops", stops_layout)
+        form.addRow(self.gradient_result_label)
+        tab = QWidget()
+        tab.setLayout(form)
+        return tab
+
+    def current_gradient(self, strict=False):          # (stops, kind, angle) or None when the gradient is off / the stops are wrong (strict: ValueError)
+        if not self.gradient_check.isChecked():
+            return None
+        try:
+            stops = parse_gradient_stops(self.gradient_stops_input.text())
+        except ValueError as e:
+            self.gradient_result_label.setText(f"Invalid stops: {e}")
+            if strict:
+                raise ValueError(f"Invalid gradient stops: {e}") from e
+            return None
+        kind = self.gradient_kind.currentText()
+        return stops, kind, self.gradient_angle.value() if kind == "Linear" else 0
+
+    ########################################
+    # Palette tab
+
+    def build_palette_tab(self):
+        self.palette_bg_input = QLineEdit("#FFFFFF")
+        self.palette_use_bg_btn = QPushButton("Use Current BG")
+        self.palette_use_bg_btn.clicked.connect(
+            lambda: self.palette_bg_input.setText(self.current_hex("bg")[:7])
+        )
+
+        self.palette_hues_spin = QSpinBox()
+        self.palette_hues_spin.setRange(1, 36)
+        self.palette_hues_spin.setValue(12)
+        self.palette_steps_spin = QSpinBox()
+        self.palette_steps_spin.setRange(2, 20)
+        self.palette_steps_spin.setValue(10)
+        self.palette_space = QComboBox()                   # HSV, or lightness x chroma in OKLCH/CIELAB
+        self.palette_space.addItems(COLOR_MODES)
+        self.palette_sat_spin = QSpinBox()                 # max saturation (max share of the in-gamut chroma in OKLCH/CIELAB)
+        self.palette_sat_spin.setRange(0, 100)
+        self.palette_sat_spin.setValue(80)
+        self.palette_level = QComboBox()
+        self.palette_level.addItems(list(PALETTE_LEVELS))
+
+        self.palette_generate_btn = QPushButton("Generate")
+        self.palette_generate_btn.clicked.connect(self.generate_palette)
+        self.palette_export_btn = QPushButton("Export Tokens…")
+        self.palette_export_btn.clicked.connect(self.export_palette)
+        self.palette_export_btn.setEnabled(False)
+        self.palette_status = QLabel("")
+
+        self.palette_table = QTableWidget()
+        self.palette_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.palette_table.cellDoubleClicked.connect(self.use_palette_cell)
+
+        self.palette_signals = PaletteSignals(self)
+        self.palette_signals.chunk_done.connect(self.on_palette_chunk_done)
+        self.palette_job = 0                    # bumps on every generate, late results from an old job get dropped
+        self.palette_parts = {}
+        self.last_palette = None                # (bg, level, [(hue, [(hex, ratio)])])
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Background:"))
+        controls.addWidget(self.palette_bg_input)
+        controls.addWidget(self.palette_use_bg_btn)
+        controls.addWidget(QLabel("Hues:"))
+        controls.addWidget(self.palette_hues_spin)
+        controls.addWidget(QLabel("Steps:"))
+        controls.addWidget(self.palette_steps_spin)
+        controls.addWidget(self.palette_space)
+        controls.addWidget(QLabel("Max sat.:"))
+        controls.addWidget(self.palette_sat_spin)
+        controls.addWidget(self.palette_level)
+        controls.addWidget(self.palette_generate_btn)
+        controls.addWidget(self.palette_export_btn)
+
+        layout = QVBoxLayout()
+        layout.addLayout(controls)
+        layout.addWidget(self.palette_status)
+        layout.addWidget(self.palette_table)
+        page = QWidget()
+        page.setLayout(layout)
+        return page
+
+    def generate_palette(self):
+        try:
+            bg_hex = normalize_hex(self.palette_bg_input.text())[:7]
+        except ValueError as e:
+            self.palette_status.setText(str(e))
+            return
+
+        self.palette_job += 1
+        job = self.palette_job
+        level = self.palette_level.currentText()
+        hues = palette_hues(self.palette_hues_spin.value())
+        args = (self.palette_sat_spin.value() / 100.0, bg_hex, PALETTE_LEVELS[level], self.palette_steps_spin.value(),
+                self.palette_space.currentText())
+
+        self.palette_request = (bg_hex, level, args)
+        self.palette_started = time.perf_counter()
+        self.palette_parts = {}
+        chunks = split_hues(hues, os.cpu_count() or 2)
+        self.palette_expected = len(chunks)
+        self.palette_generate_btn.setEnabled(False)
+        self.palette_status.setText("Generating…")
+
+        for chunk in chunks:                      #each process gets a slice of the hue circle
+            try:
+                future = palette_pool().submit(generate_palette_chunk, chunk, *args)
+            except RuntimeError as e:             # pool is broken or shutting down
+                self.palette_signals.chunk_done.emit(job, e)
+                return
+            future.add_done_callback(lambda f, job=job: self.palette_signals.chunk_done.emit(job, palette_chunk_result(f)))
+
+    def on_palette_chunk_done(self, job, rows):
+        if job != self.palette_job:
+            return
+        if isinstance(rows, BaseException):
+            self.palette_job += 1                 # the other chunks of this job are dropped
+            if isinstance(rows, BrokenProcessPool):
+                shutdown_palette_pool()
+            self.palette_generate_btn.setEnabled(True)
+            self.palette_status.setText(f"Palette generation failed: {rows}")
+            return
+        for hue, shades in rows:
+            self.palette_parts[hue] = shades
+        self.palette_expected -= 1
+        if self.palette_expected > 0:
+            return
+
+        bg_hex, level, args = self.palette_request
+        palette = sorted(self.palette_parts.items())
+        self.last_palette = (bg_hex, level, palette)
+        elapsed = (time.perf_counter() - self.palette_started) * 1000.0
+        self.palette_generate_btn.setEnabled(True)
+        self.palette_export_btn.setEnabled(True)
+        count = sum(len(shades) for _, shades in palette)
+        if count:
+            self.palette_status.setText(f"{count} shades, all ≥ {PALETTE_LEVELS[level]} on {bg_hex} · {elapsed:.0f} ms")
+        else:
+            self.palette_status.setText(f"No shade reaches {PALETTE_LEVELS[level]} on {bg_hex}")
+        self.show_palette(palette)
+
+    def show_palette(self, palette):
+        steps = max((len(shades) for _, shades in palette), default=0)
+        self.palette_table.clear()
+        self.palette_table.setRowCount(len(palette))
+        self.palette_table.setColumnCount(steps)
+        self.palette_table.setVerticalHeaderLabels([f"{round(hue * 360)}°" for hue, _ in palette])
+        for row, (hue, shades) in enumerate(palette):
+            for col, (hex_color, ratio) in enumerate(shades):
+                item = QTableWidgetItem(hex_color)
+                item.setBackground(QColor(hex_color))
+                item.setForeground(QColor("#000000") if hex_luminance(hex_color) > 0.18 else QColor("#FFFFFF"))
+                item.setToolTip(f"{hex_color} · {ratio:.2f}")
+                self.palette_table.setItem(row, col, item)
+
+    def use_palette_cell(self, row, col):             #double click a shade -> goes to the editor as FG
+        item = self.palette_table.item(row, col)
+        if item is None or self.last_palette is None:
+            return
+        self.fg_input.setText(item.text())
+        self.bg_input.setText(self.last_palette[0])
+        self.main_tabs.setCurrentWidget(self.single_page)
+
+    def export_palette(self):
+        if self.last_palette is None:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Palette", "palette.tokens.json", "Design tokens (*.json)")
+        if not file_path:
+            return
+        bg_hex, level, palette = self.last_palette
+        try:
+            export_palette_tokens(palette, bg_hex, level, file_path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Palette", f"Could not write {file_path}:\n{e}")
+
+    ########################################
+    # Documents tab
+
+    DOCUMENT_COLUMNS = ["File", "Page", "Size", "Tiles below AA", "Tiles with content", "Worst ratio"]
+
+    def build_documents_tab(self):
+        self.document_open_btn = QPushButton("Open PDF / SVG…")
+        self.document_open_btn.clicked.connect(self.open_documents)
+        self.document_dpi_spin = QSpinBox()
+        self.document_dpi_spin.setRange(36, 600)
+        self.document_dpi_spin.setSingleStep(24)
+        self.document_dpi_spin.setSuffix(" dpi")
+        self.document_dpi_spin.setValue(DOCUMENT_DPI)
+        self.document_export_btn = QPushButton("Export Report…")
+        self.document_export_btn.clicked.connect(self.export_documents)
+        self.document_export_btn.setEnabled(False)
+        self.document_status = QLabel("")
+
+        self.document_table = QTableWidget(0, len(self.DOCUMENT_COLUMNS))
+        self.document_table.setHorizontalHeaderLabels(self.DOCUMENT_COLUMNS)
+        self.document_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.document_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.document_table.verticalHeader().setDefaultSectionSize(22)
+        self.document_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.document_table.cellDoubleClicked.connect(self.open_document_page)
+
+        self.document_signals = DocumentSignals(self)
+        self.document_signals.page_done.connect(self.on_document_page_done)
+        self.document_signals.page_rendered.connect(self.on_document_page_rendered)
+        self.document_job = 0                   # same idea as palette_job
+        self.document_open_job = 0              # same for double clicked pages, only the last one is shown
+        self.document_audit = None
+        self.document_rows = []                 # row dicts in page order, None until the page is done
+
+        controls = QHBoxLayout()
+        controls.addWidget(self.document_open_btn)
+        controls.addWidget(QLabel("Resolution:"))
+        controls.addWidget(self.document_dpi_spin)
+        controls.addStretch(1)
+        controls.addWidget(self.document_export_btn)
+
+        layout = QVBoxLayout()
+        layout.addLayout(controls)
+        layout.addWidget(self.document_status)
+        layout.addWidget(self.document_table)
+        page = QWidget()
+        page.setLayout(layout)
+        return page
+
+    def open_documents(self):
+        paths, _ = QFileDialog.getOpenFileNames(self, "Select Documents", "", "Documents (*.pdf *.svg)")
+        if paths:
+            self.audit_documents(paths)
+
+    def audit_documents(self, paths):
+        pages, errors = [], []
+        for path in paths:
+            try:
+                pages.extend(document_pages(path))
+            except ValueError as e:
+                errors.append(str(e))
+
+        self.document_job += 1
+        self.document_started = time.perf_counter()
+        self.document_errors = errors
+        self.document_rows = [None] * len(pages)
+        self.document_table.setRowCount(len(pages))
+        for row, (path, page, _) in enumerate(pages):
+            self.document_table.setItem(row, 0, QTableWidgetItem(os.path.basename(path)))
+            self.document_table.setItem(row, 1, QTableWidgetItem(str(page + 1)))
+            self.document_table.setItem(row, 2, QTableWidgetItem("…"))
+        self.document_export_btn.setEnabled(False)
+        if not pages:
+            self.show_document_status("No pages")
+            return
+        self.document_open_btn.setEnabled(False)
+        self.document_status.setText(f"Analyzing {len(pages)} pages…")
+        self.document_audit = DocumentAudit(self.document_job, pages, self.document_dpi_spin.value(), self.document_signals)
+        self.document_audit.fill()
+
+    def on_document_page_done(self, job, index, row):
+        if job != self.document_job:
+            return
+        if isinstance(row, str):                 # error text
+            path, page, _ = self.document_audit.pages[index]
+            self.document_errors.append(f"{os.path.basename(path)} page {page + 1}: {row}")
+            item = QTableWidgetItem(row)
+            item.setToolTip(row)
+            item.setForeground(QColor("#C62828"))
+            self.document_table.setItem(index, 2, item)
+        else:
+            self.document_rows[index] = row
+            worst = row["worst_ratio"]
+            cells = [f"{row['width']}×{row['height']}", row["tiles_below_aa"], row["tiles_with_content"],
+                     "–" if worst is None else round(worst, 2)]
+            for col, value in enumerate(cells, start=2):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                self.document_table.setItem(index, col, item)
+            self.document_table.item(index, 0).setIcon(QIcon(QPixmap.fromImage(row["thumbnail"])))
+            if row["tiles_below_aa"]:
+                self.document_table.item(index, 3).setForeground(QColor("#C62828"))
+
+        audit = self.document_audit
+        if not audit.finish_page(index):
+            self.document_status.setText(f"Analyzing… {audit.done}/{len(audit.pages)} pages")
+            return
+        elapsed = time.perf_counter() - self.document_started
+        failing = sum(1 for r in self.document_rows if r is not None and r["tiles_below_aa"])
+        self.show_document_status(f"{len(audit.pages)} pages · {failing} with text below AA · {elapsed:.1f} s")
+        self.document_open_btn.setEnabled(True)
+        self.document_export_btn.setEnabled(True)
+        release_pdf_documents()
+
+    def show_document_status(self, summary):      # summary line, then what could not be opened or rendered
+        errors = self.document_errors
+        if not errors:
+            self.document_status.setText(summary)
+            self.document_status.setToolTip("")
+            return
+        lines = [f"{summary} · {len(errors)} errors"] + errors[:DOCUMENT_ERRORS_SHOWN]
+        if len(errors) > DOCUMENT_ERRORS_SHOWN:
+            lines.append(f"… {len(errors) - DOCUMENT_ERRORS_SHOWN} more")
+        self.document_status.setText("\n".join(lines))
+        self.document_status.setToolTip("\n".join(errors))
+
+    def open_document_page(self, row, col):           # double click -> page into the image viewer for the pipette
+        if self.document_audit is None or row >= len(self.document_audit.pages):
+            return
+        path, page, _ = self.document_audit.pages[row]
+        self.document_open_job += 1
+        job = self.document_open_job
+        future = document_pool().submit(rasterize_page, path, page, self.document_audit.dpi)
+        future.add_done_callback(lambda f: self.document_signals.page_rendered.emit(
+            job, f.result() if f.exception() is None else str(f.exception())
+        ))
+
+    def on_document_page_rendered(self, job, image):
+        release_pdf_documents()
+        if job != self.document_open_job:
+            return
+        if isinstance(image, str) or image.isNull():
+            self.document_status.setText(image if isinstance(image, str) else "The page could not be rendered")
+            return
+        self.live_check.setChecked(False)
+        self.show_image(image)
+        self.main_tabs.setCurrentWidget(self.single_page)
+
+    def export_documents(self):
+        rows = [r for r in self.document_rows if r is not None]
+        if not rows:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Report", "document-report.json", "JSON (*.json)")
+        if not file_path:
+            return
+        try:
+            export_document_report(rows, self.document_audit.dpi, file_path, self.document_errors)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Report", f"Could not write {file_path}:\n{e}")
+
+    ########################################
+    # Worksheet tab
+
+    def build_worksheet_tab(self):
+        self.pairs_model = ContrastPairsModel(self)
+        self.pairs_proxy = FailureFilterProxy(self)
+        self.pairs_proxy.setSourceModel(self.pairs_model)
+
+        self.pairs_view = QTableView()
+        self.pairs_view.setModel(self.pairs_proxy)
+        self.pairs_view.setSortingEnabled(True)
+        self.pairs_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.pairs_view.verticalHeader().setDefaultSectionSize(22)              #fixed row height so the view doesnt measure every row
+        self.pairs_view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.pairs_view.horizontalHeader().setStretchLastSection(True)
+        self.pairs_view.doubleClicked.connect(self.load_selected_pair)
+
+        self.add_pair_btn = QPushButton("Add Current Pair")
+        self.add_pair_btn.clicked.connect(self.add_current_pair)
+        self.remove_pair_btn = QPushButton("Remove Selected")
+        self.remove_pair_btn.clicked.connect(self.remove_selected_pairs)
+        self.load_pair_btn = QPushButton("Load Into Editor")
+        self.load_pair_btn.clicked.connect(self.load_selected_pair)
+
+        self.import_tokens_btn = QPushButton("Import Tokens…")
+        self.import_tokens_btn.clicked.connect(self.import_tokens)
+        self.export_audit_btn = QPushButton("Export Audit…")
+        self.export_audit_btn.clicked.connect(self.export_audit)
+        self.last_token_file = None
+
+        self.pairs_filter = QComboBox()
+        self.pairs_filter.addItems(FailureFilterProxy.FILTERS)
+        self.pairs_filter.currentIndexChanged.connect(self.pairs_proxy.set_mode)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.add_pair_btn)
+        buttons.addWidget(self.remove_pair_btn)
+        buttons.addWidget(self.load_pair_btn)
+        buttons.addWidget(self.import_tokens_btn)
+        buttons.addWidget(self.export_audit_btn)
+        buttons.addStretch(1)
+        buttons.addWidget(QLabel("Show:"))
+        buttons.addWidget(self.pairs_filter)
+
+        layout = QVBoxLayout()
+        layout.addLayout(buttons)
+        layout.addWidget(self.pairs_view)
+        page = QWidget()
+        page.setLayout(layout)
+        return page
+
+    def import_tokens(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import Design Tokens", "",
+            "Design tokens (*.json *.css *.js *.cjs *.mjs *.ts);;All files (*)"
+        )
+        if not file_path:
+            return
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            tokens = load_token_file(file_path)
+            entries, errors = audit_token_pairs(tokens)
+        except (OSError, ValueError) as e:                      # json.JSONDecodeError is a ValueError too
+            QApplication.restoreOverrideCursor()
+            QMessageBox.warning(self, "Import Tokens", f"Could not read {file_path}:\n{e}")
+            return
+        self.pairs_model.add_pairs([(e["name"], e["foreground"], e["background"]) for e in entries])
+        QApplication.restoreOverrideCursor()
+
+        self.last_token_file = file_path
+        msg = f"{len(tokens.raw)} tokens, {len(entries)} pairs added."
+        if errors:
+            msg += f"\n\n{len(errors)} pairs skipped, first one:\n{errors[0]}"
+        QMessageBox.information(self, "Import Tokens", msg)
+
+    def export_audit(self):
+        file_path, chosen = QFileDialog.getSaveFileName(
+            self, "Export Audit", "contrast-audit.json", "JSON (*.json);;SARIF (*.sarif)"
+        )
+        if not file_path:
+            return
+        entries = self.pairs_model.audit_entries()
+        try:
+            if file_path.lower().endswith(".sarif") or chosen.startswith("SARIF"):
+                export_audit_sarif(entries, file_path, self.last_token_file)
+            else:
+                export_audit_json(entries, file_path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Audit", f"Could not write {file_path}:\n{e}")
+
+    def add_current_pair(self):
+        fg_hex = self.current_hex("fg")
+        bg_hex = self.current_hex("bg")
+        name = f"Pair {self.pairs_model.rowCount() + 1}"
+        self.pairs_model.add_pairs([(name, fg_hex, bg_hex)])
+
+    def selected_pair_rows(self):          # view rows -> model rows (the view can be sorted/filtered)
+        rows = self.pairs_view.selectionModel().selectedRows()
+        return [self.pairs_proxy.mapToSource(index).row() for index in rows]
+
+    def remove_selected_pairs(self):
+        self.pairs_model.remove_rows(self.selected_pair_rows())
+
+    def load_selected_pair(self):
+        rows = self.selected_pair_rows()
+        if not rows:
+            return
+        _, fg_hex, bg_hex = self.pairs_model.rows[rows[0]][:3]
+        self.fg_input.setText(fg_hex)
+        self.bg_input.setText(bg_hex)
+        self.main_tabs.setCurrentWidget(self.single_page)
+
     ########################################
     # Recommendation
     
@@ -499,9 +3017,10 @@ class ContrastCheckerWidget(QWidget):
         for existing in self.custom_colors:             # Up to 16 different  custom colors
             if existing.rgb() == color.rgb():
                 return
-        if len(self.custom_colors) >= 16:
+        if len(self.custom_colors) >= 16:               # QColorDialog only has 16 custom slots
             self.custom_colors.pop(0)
         self.custom_colors.append(color)
+        self.schedule_session_save()
 
     def setup_color_dialog(self, initial: QColor) -> QColorDialog:
         dialog = QColorDialog(self)
@@ -519,16 +3038,195 @@ class ContrastCheckerWidget(QWidget):
             self, "Select Image", "", "Images (*.png *.jpg *.jpeg *.bmp)"
         )
         if file_path:
-            pixmap = QPixmap(file_path)
-            pixmap = pixmap.scaled(
-                self.upload_image_label.size(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            self.upload_image_label.setPixmap(pixmap)
-            self.upload_image_label.setText("")
+            self.open_image(file_path)
         else:
-            self.upload_image_label.setText("No image uploaded")
+            self.image_viewer.set_message("No image uploaded")
+
+    def open_image(self, file_path):
+        image = QImage(file_path)
+        if image.isNull():
+            self.image_viewer.set_message("Could not open image")
+            return
+        self.live_check.setChecked(False)
+        thumb = image.scaled(THUMBNAIL_SIZE, THUMBNAIL_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.show_image(image)
+        self.remember_recent_image(file_path, thumb)
+
+    def show_image(self, image):           #new file or captured frame -> pipette array, heatmap tiles, preview
+        self.source_image = image
+        self.source_rgb = qimage_to_rgb_array(image)
+        analyzed = self.heatmap.update(self.source_rgb)
+        failing, content = self.heatmap.counts()
+        total = self.heatmap.ratios.size
+        info = f"{image.width()}×{image.height()} · {failing} of {content} tiles with content below AA"
+        if self.live_check.isChecked():
+            info += f" · re-analyzed {analyzed}/{total}"
+        self.image_info_label.setText(info)
+        self.image_viewer.set_image(image)
+        self.refresh_image_display()
+
+    def refresh_image_display(self):
+        if self.source_image is None:
+            return
+        overlay = self.heatmap.overlay() if self.heatmap_check.isChecked() else None
+        self.image_viewer.set_overlay(overlay, self.heatmap.tile)
+
+    def sample_image_pixel(self, x, y, button):           # pipette
+        hex_color = rgb_array_hex(self.source_rgb, x, y)
+        if button == Qt.RightButton:
+            self.bg_input.setText(hex_color)
+        else:
+            self.fg_input.setText(hex_color)
+
+    ############################################################################
+    # Screen capture / region + live mode
+
+    def capture_screen(self):
+        screen = QGuiApplication.screenAt(self.mapToGlobal(self.rect().center())) or QGuiApplication.primaryScreen()
+        if not screen_grab_available():
+            self.capture_rect = None                #headless, there is no screen to select from, use the window framebuffer
+            self.show_image(grab_screen_region(None, self.window()))
+            return
+        self.window().hide()                        # so the app is not in its own screenshot
+        QTimer.singleShot(250, lambda: self.begin_region_select(screen))
+
+    def begin_region_select(self, screen):
+        self.region_selector = RegionSelector(screen)
+        self.region_selector.selected.connect(self.on_region_selected)
+        self.region_selector.cancelled.connect(self.window().show)
+        self.region_selector.showFullScreen()
+
+    def on_region_selected(self, rect):
+        shot = self.region_selector.shot
+        ratio = shot.devicePixelRatio()
+        local = rect.translated(-self.region_selector.geo.topLeft())
+        image = shot.copy(QRect(
+            round(local.x() * ratio), round(local.y() * ratio), round(local.width() * ratio), round(local.height() * ratio)
+        )).toImage()                                # crop the frozen shot, no second grab
+        self.window().show()
+        self.capture_rect = rect
+        self.live_check.setChecked(False)
+        self.update_live_check()
+        self.show_image(image)
+
+    def update_live_check(self):         #live needs a selected region, grabbing the own window would just film the viewer filming itself
+        can_go_live = self.capture_rect is not None or not screen_grab_available()       # headless: the window framebuffer is all there is
+        if not can_go_live:
+            self.live_check.setChecked(False)
+        self.live_check.setEnabled(can_go_live)
+        self.live_check.setToolTip(
+            "Capture the region again at the interval,\nonly changed tiles are analyzed again" if can_go_live
+            else "Capture a screen region first"
+        )
+
+    def set_live_capture(self, on):
+        if on:
+            self.live_timer.start()
+        else:
+            self.live_timer.stop()
+
+    def capture_live_frame(self):
+        self.show_image(grab_screen_region(self.capture_rect, self.window()))
+
+    def remember_recent_image(self, file_path, thumb):
+        self.recent_images = [(p, t) for p, t in self.recent_images if p != file_path]
+        self.recent_images.insert(0, (file_path, thumb))
+        del self.recent_images[RECENT_IMAGE_LIMIT:]
+        self.rebuild_recent_images_menu()
+        if self.session_store is not None:
+            self.session_store.add_recent_image_async(file_path, thumb)
+
+    def rebuild_recent_images_menu(self):
+        self.recent_images_menu.clear()
+        for path, thumb in self.recent_images:
+            action = self.recent_images_menu.addAction(QIcon(QPixmap.fromImage(thumb)), os.path.basename(path))
+            action.setToolTip(path)
+            action.triggered.connect(lambda checked=False, p=path: self.open_image(p))
+        self.recent_images_btn.setEnabled(bool(self.recent_images))
+
+    ############################################################################
+    # Session / save + restore
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.cold_start_ms is None and not self.first_paint_pending:       # children paint in the same pass, so right after this the frame is done
+            self.first_paint_pending = True
+            QTimer.singleShot(0, self.on_first_paint)
+
+    def on_first_paint(self):              #called once the first frame is painted, the session loads after that
+        self.cold_start_ms = (time.perf_counter() - _PROCESS_START) * 1000.0
+        self.first_painted.emit(self.cold_start_ms)
+        if self.session_store is not None:
+            self.session_store.signals.loaded.connect(self.apply_session)
+            self.session_store.signals.load_failed.connect(self.on_session_load_failed)
+            self.session_store.signals.failed.connect(self.show_session_problem)
+            self.session_store.load_async()
+
+    def on_session_load_failed(self, message):
+        self.restoring_session = False            # nothing to protect, start saving the current state
+        self.show_session_problem(message)
+
+    def show_session_problem(self, message):      # the app keeps working, the user just has to know it won't remember
+        self.session_status.setText(message)
+        self.session_status.show()
+
+    def apply_session(self, data):
+        settings = data.get("settings", {})
+        self.restoring_session = True
+        try:
+            if "fg" in settings:
+                self.fg_input.setText(settings["fg"])
+            if "bg" in settings:
+                self.bg_input.setText(settings["bg"])
+            if "preview_text" in settings:
+                self.preview_text_input.setText(settings["preview_text"])
+            if "font_size" in settings:
+                self.font_size_spin.setValue(int(settings["font_size"]))
+            if "bold" in settings:
+                self.bold_check.setChecked(settings["bold"] == "1")
+            if settings.get("color_mode") in COLOR_MODES:
+                self.color_mode_combo.setCurrentText(settings["color_mode"])
+            if (settings.get("theme") == "dark") != self.is_dark_mode:
+                self.toggleTheme()
+
+            self.custom_colors = [QColor.fromRgb(rgb) for rgb in data.get("swatches", [])][-16:]
+            self.recent_images = list(data.get("recent", []))[:RECENT_IMAGE_LIMIT]
+            self.rebuild_recent_images_menu()
+        except ValueError as e:                  # whatever came before the bad value is restored, the rest keeps the defaults
+            self.show_session_problem(f"Session partly restored: {e}")
+        finally:
+            self.restoring_session = False
+
+    def schedule_session_save(self):
+        if self.session_store is not None and not self.restoring_session:
+            self.save_timer.start()
+
+    def save_session(self):
+        if self.session_store is None:
+            return
+        settings = {
+            "fg": self.fg_input.text(),
+            "bg": self.bg_input.text(),
+            "preview_text": self.preview_text_input.text(),
+            "font_size": str(self.font_size_spin.value()),
+            "bold": "1" if self.bold_check.isChecked() else "0",
+            "theme": "dark" if self.is_dark_mode else "light",
+            "color_mode": self.color_mode,
+        }
+        if self.cold_start_ms is not None:
+            settings["last_cold_start_ms"] = f"{self.cold_start_ms:.0f}"
+        self.session_store.save_async(settings, [c.rgb() for c in self.custom_colors])
+
+    def closeEvent(self, event):
+        self.live_timer.stop()
+        shutdown_palette_pool()
+        if self.session_store is not None:
+            self.save_timer.stop()
+            if not self.restoring_session:         # closed before the session was back, keep what is stored
+                self.save_session()
+            self.session_store.close()             # flushes the pending writes
+            self.session_store = None
+        super().closeEvent(event)
 
     ############################################################################
     # Sliders / Help 
@@ -563,48 +3261,20 @@ class ContrastCheckerWidget(QWidget):
         if not app:
             return
 
-        if not self.is_dark_mode:                                   #el mejor cambio que pude haber hecho, tengo sueno
-            dark_palette = QPalette()
-            dark_palette.setColor(QPalette.Window, QColor(45, 45, 45))
-            dark_palette.setColor(QPalette.WindowText, Qt.white)
-            dark_palette.setColor(QPalette.Base, QColor(30, 30, 30))
-            dark_palette.setColor(QPalette.AlternateBase, QColor(45, 45, 45))
-            dark_palette.setColor(QPalette.ToolTipBase, Qt.white)
-            dark_palette.setColor(QPalette.ToolTipText, Qt.white)
-            dark_palette.setColor(QPalette.Text, Qt.white)
-            dark_palette.setColor(QPalette.Button, QColor(45, 45, 45))
-            dark_palette.setColor(QPalette.ButtonText, Qt.white)
-            dark_palette.setColor(QPalette.BrightText, Qt.red)
-            dark_palette.setColor(QPalette.Link, QColor(42, 130, 218))
-            dark_palette.setColor(QPalette.Highlight, QColor(90, 150, 240))
-            dark_palette.setColor(QPalette.HighlightedText, Qt.black)
-
-            app.setStyle("Fusion")
-            app.setPalette(dark_palette)
-            app.setStyleSheet(DARK_STYLESHEET)
-            self.toggle_theme_btn.setText("Light Mode")
-            self.is_dark_mode = True
-        else:
-            light_palette = QPalette()
-            light_palette.setColor(QPalette.Window, QColor(240, 240, 240))
-            light_palette.setColor(QPalette.WindowText, Qt.black)
-            light_palette.setColor(QPalette.Base, Qt.white)
-            light_palette.setColor(QPalette.AlternateBase, QColor(225, 225, 225))
-            light_palette.setColor(QPalette.ToolTipBase, Qt.white)
-            light_palette.setColor(QPalette.ToolTipText, Qt.black)
-            light_palette.setColor(QPalette.Text, Qt.black)
-            light_palette.setColor(QPalette.Button, QColor(240, 240, 240))
-            light_palette.setColor(QPalette.ButtonText, Qt.black)
-            light_palette.setColor(QPalette.BrightText, Qt.red)
-            light_palette.setColor(QPalette.Link, QColor(0, 120, 215))
-            light_palette.setColor(QPalette.Highlight, QColor(0, 120, 215))
-            light_palette.setColor(QPalette.HighlightedText, Qt.white)
-
-            app.setStyle("Fusion")
-            app.setPalette(light_palette)
-            app.setStyleSheet(LIGHT_STYLESHEET)
-            self.toggle_theme_btn.setText("Dark Mode")
-            self.is_dark_mode = False
+        started = time.perf_counter()
+        self.apply_theme(not self.is_dark_mode)          #el mejor cambio que pude haber hecho, tengo sueno
+        self.render_result()                             # same result, new theme colors
+        self.last_theme_switch_ms = (time.perf_counter() - started) * 1000.0
+        self.toggle_theme_btn.setToolTip(f"Last theme switch: {self.last_theme_switch_ms:.1f} ms")
+        self.schedule_session_save()
+
+    def apply_theme(self, dark):
+        palette, stylesheet = prebuilt_theme(dark)
+        QApplication.instance().setPalette(palette)       # Fusion is set once in main, setting it again re-polishes everything
+        self.setStyleSheet(stylesheet)                    # only this window gets re-polished, not the whole app
+        self.result_card.set_theme(dark)
+        self.toggle_theme_btn.setText("Light Mode" if dark else "Dark Mode")
+        self.is_dark_mode = dark
 
     ########################################################################################
     # Force "#" in line edits
@@ -674,6 +3344,80 @@ class ContrastCheckerWidget(QWidget):
             self.bg_input.blockSignals(False)
             self.on_bg_input_changed()
 
+    ############################################################################
+    # Color mode / HSV, OKLCH or CIELAB sliders
+
+    SLIDER_TEXTS = {                 # mode -> (name, help) for the hue / 2nd / 3rd slider
+        "HSV": [
+            ("Hue", "Hue slider.\n0..360°.\nControls color angle."),
+            ("Saturation", "Saturation slider.\n0..100.\n0=gray, 100=vivid."),
+            ("Brightness", "Brightness slider.\n0..100.\n0=black, 100=bright."),
+        ],
+        "OKLCH": [
+            ("Hue", "OKLCH hue.\n0..360°."),
+            ("Chroma", "OKLCH chroma.\n0..100 = 0..0.37.\nClipped to what sRGB can show."),
+            ("Lightness", "OKLCH lightness.\n0..100.\nSame step = same perceived change."),
+        ],
+        "CIELAB": [
+            ("Hue", "CIELAB LCh hue.\n0..360°."),
+            ("Chroma", "CIELAB chroma.\n0..100 = 0..150.\nClipped to what sRGB can show."),
+            ("Lightness", "CIELAB L*.\n0..100.\nSame step = same perceived change."),
+        ],
+    }
+
+    def sliders_for(self, side):
+        if side == "fg":
+            return self.hue_slider_fg, self.sat_slider_fg, self.bri_slider_fg, self.opa_slider_fg
+        return self.hue_slider_bg, self.sat_slider_bg, self.bri_slider_bg, self.opa_slider_bg
+
+    def set_color_mode(self, mode):
+        self.color_mode = mode
+        if mode != "HSV":
+            max_chroma_table(mode)              # build the gamut table now, not on the first drag
+        for names, helps in ((self.slider_names_fg, self.slider_helps_fg), (self.slider_names_bg, self.slider_helps_bg)):
+            for label, help_btn, (name, tip) in zip(names, helps, self.SLIDER_TEXTS[mode]):
+                label.setText(name)
+                help_btn.setToolTip(tip)
+        self.on_fg_input_changed()              #put the sliders where the current colors are in the new mode
+        self.on_bg_input_changed()
+
+    def sync_perceptual_sliders(self, side, hex_color):
+        hue_s, chroma_s, light_s, _ = self.sliders_for(side)
+        hue, chroma, light = hex_to_perceptual_sliders(self.color_mode, hex_color)
+        for slider, value in ((hue_s, hue), (chroma_s, chroma), (light_s, light)):
+            if value is None:                   # grays have no hue, leave it where it was
+                continue
+            slider.blockSignals(True)
+            slider.setValue(value)
+            slider.blockSignals(False)
+
+    def on_perceptual_slider_changed(self, side):         #sliders -> hex, then the HSV state like any other edit
+        hue_s, chroma_s, light_s, opa_s = self.sliders_for(side)
+        new_hex = perceptual_sliders_to_hex(
+            self.color_mode, hue_s.value(), chroma_s.value(), light_s.value(), opa_s.value() / 100.0
+        )
+        h, s, v, a = hex_to_hsv(new_hex)
+        line_edit = self.fg_input if side == "fg" else self.bg_input
+        if side == "fg":
+            self.fg_h, self.fg_s, self.fg_v, self.fg_a = h, s, v, a
+            self.fg_hex = new_hex
+        else:
+            self.bg_h, self.bg_s, self.bg_v, self.bg_a = h, s, v, a
+            self.bg_hex = new_hex
+        line_edit.blockSignals(True)
+        line_edit.setText(new_hex)
+        line_edit.blockSignals(False)
+        self.update_preview()
+
+    def current_hex(self, side):         # what Calculate, the preview and the worksheet use
+        if side == "fg":
+            exact, hsv = self.fg_hex, (self.fg_h, self.fg_s, self.fg_v, self.fg_a)
+        else:
+            exact, hsv = self.bg_hex, (self.bg_h, self.bg_s, self.bg_v, self.bg_a)
+        if self.color_mode != "HSV" and exact is not None:
+            return exact
+        return hsv_to_hex(*hsv)
+
     ############################################################################
     # FG: line edit to -> HSV
     
@@ -683,19 +3427,23 @@ class ContrastCheckerWidget(QWidget):
             return
         try:
             h, s, v, a = hex_to_hsv(txt)
+            self.fg_hex = normalize_hex(txt) if self.color_mode != "HSV" else None
             self.fg_h, self.fg_s, self.fg_v, self.fg_a = h, s, v, a
 
-            self.hue_slider_fg.blockSignals(True)
-            self.hue_slider_fg.setValue(int(h * 360))
-            self.hue_slider_fg.blockSignals(False)
+            if self.color_mode != "HSV":
+                self.sync_perceptual_sliders("fg", txt)
+            else:
+                self.hue_slider_fg.blockSignals(True)
+                self.hue_slider_fg.setValue(int(h * 360))
+                self.hue_slider_fg.blockSignals(False)
 
-            self.sat_slider_fg.blockSignals(True)
-            self.sat_slider_fg.setValue(int(s * 100))
-            self.sat_slider_fg.blockSignals(False)
+                self.sat_slider_fg.blockSignals(True)
+                self.sat_slider_fg.setValue(int(s * 100))
+                self.sat_slider_fg.blockSignals(False)
 
-            self.bri_slider_fg.blockSignals(True)
-            self.bri_slider_fg.setValue(int(v * 100))
-            self.bri_slider_fg.blockSignals(False)
+                self.bri_slider_fg.blockSignals(True)
+                self.bri_slider_fg.setValue(int(v * 100))
+                self.bri_slider_fg.blockSignals(False)
 
             self.opa_slider_fg.blockSignals(True)
             self.opa_slider_fg.setValue(int(a * 100))
@@ -706,27 +3454,38 @@ class ContrastCheckerWidget(QWidget):
             pass
 
     def on_fg_hue_changed(self, val):
+        if self.color_mode != "HSV":
+            self.on_perceptual_slider_changed("fg")
+            return
         self.fg_h = val / 360.0
         self.write_fg_line_edit()
         self.update_preview()
 
     def on_fg_saturation_changed(self, val):
+        if self.color_mode != "HSV":
+            self.on_perceptual_slider_changed("fg")
+            return
         self.fg_s = val / 100.0
         self.write_fg_line_edit()
         self.update_preview()
 
     def on_fg_brightness_changed(self, val):
+        if self.color_mode != "HSV":
+            self.on_perceptual_slider_changed("fg")
+            return
         self.fg_v = val / 100.0
         self.write_fg_line_edit()
         self.update_preview()
 
     def on_fg_opacity_changed(self, val):
         self.fg_a = val / 100.0
+        if self.color_mode != "HSV" and self.fg_hex is not None:      # only the alpha changes, the rgb stays what the sliders made
+            self.fg_hex = hex_with_alpha(self.fg_hex, self.fg_a)
         self.write_fg_line_edit()
         self.update_preview()
 
     def write_fg_line_edit(self):
-        new_hex = hsv_to_hex(self.fg_h, self.fg_s, self.fg_v, self.fg_a)
+        new_hex = self.current_hex("fg")
         self.fg_input.blockSignals(True)
         self.fg_input.setText(new_hex)
         self.fg_input.blockSignals(False)
@@ -740,19 +3499,23 @@ class ContrastCheckerWidget(QWidget):
             return
         try:
             h, s, v, a = hex_to_hsv(txt)
+            self.bg_hex = normalize_hex(txt) if self.color_mode != "HSV" else None
             self.bg_h, self.bg_s, self.bg_v, self.bg_a = h, s, v, a
 
-            self.hue_slider_bg.blockSignals(True)
-            self.hue_slider_bg.setValue(int(h * 360))
-            self.hue_slider_bg.blockSignals(False)
+            if self.color_mode != "HSV":
+                self.sync_perceptual_sliders("bg", txt)
+            else:
+                self.hue_slider_bg.blockSignals(True)
+                self.hue_slider_bg.setValue(int(h * 360))
+                self.hue_slider_bg.blockSignals(False)
 
-            self.sat_slider_bg.blockSignals(True)
-            self.sat_slider_bg.setValue(int(s * 100))
-            self.sat_slider_bg.blockSignals(False)
+                self.sat_slider_bg.blockSignals(True)
+                self.sat_slider_bg.setValue(int(s * 100))
+                self.sat_slider_bg.blockSignals(False)
 
-            self.bri_slider_bg.blockSignals(True)
-            self.bri_slider_bg.setValue(int(v * 100))
-            self.bri_slider_bg.blockSignals(False)
+                self.bri_slider_bg.blockSignals(True)
+                self.bri_slider_bg.setValue(int(v * 100))
+                self.bri_slider_bg.blockSignals(False)
 
             self.opa_slider_bg.blockSignals(True)
             self.opa_slider_bg.setValue(int(a * 100))
@@ -763,27 +3526,38 @@ class ContrastCheckerWidget(QWidget):
             pass
 
     def on_bg_hue_changed(self, val):
+        if self.color_mode != "HSV":
+            self.on_perceptual_slider_changed("bg")
+            return
         self.bg_h = val / 360.0
         self.write_bg_line_edit()
         self.update_preview()
 
     def on_bg_saturation_changed(self, val):
+        if self.color_mode != "HSV":
+            self.on_perceptual_slider_changed("bg")
+            return
         self.bg_s = val / 100.0
         self.write_bg_line_edit()
         self.update_preview()
 
     def on_bg_brightness_changed(self, val):
+        if self.color_mode != "HSV":
+            self.on_perceptual_slider_changed("bg")
+            return
         self.bg_v = val / 100.0
         self.write_bg_line_edit()
         self.update_preview()
 
     def on_bg_opacity_changed(self, val):
         self.bg_a = val / 100.0
+        if self.color_mode != "HSV" and self.bg_hex is not None:      # only the alpha changes, the rgb stays what the sliders made
+            self.bg_hex = hex_with_alpha(self.bg_hex, self.bg_a)
         self.write_bg_line_edit()
         self.update_preview()
 
     def write_bg_line_edit(self):
-        new_hex = hsv_to_hex(self.bg_h, self.bg_s, self.bg_v, self.bg_a)
+        new_hex = self.current_hex("bg")
         self.bg_input.blockSignals(True)
         self.bg_input.setText(new_hex)
         self.bg_input.blockSignals(False)
@@ -792,8 +3566,8 @@ class ContrastCheckerWidget(QWidget):
     # Live Preview
     
     def update_preview(self):
-        fg_hex = hsv_to_hex(self.fg_h, self.fg_s, self.fg_v, self.fg_a)    #makes sure that  the preview  shows exactly the user specified FG and BG colors,unaffected by Dark and Light mode 
-        bg_hex = hsv_to_hex(self.bg_h, self.bg_s, self.bg_v, self.bg_a)
+        fg_hex = self.current_hex("fg")    #makes sure that  the preview  shows exactly the user specified FG and BG colors,unaffected by Dark and Light mode 
+        bg_hex = self.current_hex("bg")
 
         fg_css = hex_to_rgba_str(fg_hex)
         bg_css = hex_to_rgba_str(bg_hex)
@@ -802,178 +3576,197 @@ class ContrastCheckerWidget(QWidget):
         if not custom_text:
             custom_text = " "
 
+        gradient = self.current_gradient()
+        if gradient is not None:
+            bg_css = gradient_qss(*gradient)
+        self.gradient_angle.setEnabled(self.gradient_kind.currentText() == "Linear")
+
         self.preview_label.setStyleSheet(                             # Directly override the labe style sheet, ignoring D/L mode
-            f"QLabel {{ color: {fg_css}; background-color: {bg_css}; border: 1px solid #444; }}"
+            f"QLabel {{ color: {fg_css}; background: {bg_css}; border: 1px solid #444; }}"
         )
 
+        font = QFont(self.preview_label.font())
+        font.setPointSize(self.font_size_spin.value())
+        font.setBold(self.bold_check.isChecked())
+        self.preview_label.setFont(font)
         self.preview_label.setText(custom_text)
 
+        if gradient is None:
+            self.update_rendered_contrast(custom_text, font, fg_hex, bg_hex)
+        else:
+            stats = gradient_contrast(fg_hex, *gradient)
+            summary = f"Gradient: worst {stats['worst']:.2f} · area-weighted {stats['weighted']:.2f}"
+            self.rendered_label.setText(summary)
+            self.gradient_result_label.setText(
+                f"{summary} · best {stats['best']:.2f}\n{stats['aa_area'] * 100:.0f}% of the area passes AA (4.5)"
+            )
+        self.schedule_session_save()
+
+    def update_rendered_contrast(self, text, font, fg_hex, bg_hex):          #rasterize the preview offscreen and measure the glyph pixels (cached, so its ok live)
+        point_size = font.pointSize()
+        bold = font.bold()
+        size_name = "Large text" if is_large_text(point_size, bold) else "Regular text"
+        ratio = rendered_glyph_contrast(text, font.family(), point_size, bold, fg_hex, bg_hex)
+        if ratio is None:
+            self.rendered_label.setText(f"{size_name} ({point_size}pt)")
+        else:
+            self.rendered_label.setText(f"Rendered glyph contrast: {ratio:.2f} · {size_name} ({point_size}pt)")
+        return ratio
+
     #######################################################################################
     # Calculate and display WCAG contrast
     
     def calculate_wcw_contrast(self):
-        fg_hex = hsv_to_hex(self.fg_h, self.fg_s, self.fg_v, self.fg_a)
-        bg_hex = hsv_to_hex(self.bg_h, self.bg_s, self.bg_v, self.bg_a)
+        fg_hex = self.current_hex("fg")
+        bg_hex = self.current_hex("bg")
 
         if self.fg_a < 0.2 and self.bg_a < 0.2:
-            self.result_label.setText(self._styled_fail_card("Both FG & BG < 20% opacity"))               #si opacity es menor a20% error para FG y BG
-            self.last_ratio = None
+            self.show_fail_result("Both FG & BG < 20% opacity")               #si opacity es menor a20% error para FG y BG
             return
         elif self.fg_a < 0.2:
-            self.result_label.setText(self._styled_fail_card("Foreground < 20% opacity"))
-            self.last_ratio = None
+            self.show_fail_result("Foreground < 20% opacity")
             return
-        elif self.bg_a < 0.2:
-            self.result_label.setText(self._styled_fail_card("Background < 20% opacity"))
-            self.last_ratio = None
+        elif self.bg_a < 0.2 and not self.gradient_check.isChecked():
+            self.show_fail_result("Background < 20% opacity")
             return
 
         try:
-            ratio = contrast_ratio(fg_hex, bg_hex)
+            gradient = self.current_gradient(strict=True)
+            if gradient is None:
+                ratio = contrast_ratio(fg_hex, bg_hex)
+            else:
+                stats = gradient_contrast(fg_hex, *gradient)
+                ratio = stats["worst"]                             # on a gradient the text has to pass everywhere
             self.last_ratio = ratio
                                                                 
             results = check_conformance(ratio)                   #lo que saldria en los resultados una vez que termine los calculos
             c1_normal = results.get("AA (Normal Text)", "Fail")
             c1_large = results.get("AA (Large Text)", "Fail")
             c2_normal = results.get("AAA (Normal Text)", "Fail")
-            c2_large = c2_normal
+            c2_large = "Pass" if ratio >= 4.5 else "Fail"         # AAA for large text only needs 4.5
             c3_nt = "Pass" if ratio >= 3.0 else "Fail"
 
+            large = is_large_text(self.font_size_spin.value(), self.bold_check.isChecked())     #only show the column that applies to the preview font
+            size_name = "Large Text" if large else "Regular Text"
+
             results_criteria = [
                 {
                     "title": "1.4.3 (AA) Minimum Contrast",
-                    "regular": c1_normal,
-                    "large": c1_large
+                    "label": size_name,
+                    "status": c1_large if large else c1_normal
                 },
                 {
                     "title": "1.4.6 (AAA) Enhanced Contrast",
-                    "regular": c2_normal,
-                    "large": c2_large
+                    "label": size_name,
+                    "status": c2_large if large else c2_normal
                 },
                 {
                     "title": "1.4.11 Non-text Contrast (AA)",
-                    "regular": c3_nt,
-                    "large": c3_nt
+                    "label": "UI Components",
+                    "status": c3_nt
                 }
             ]
 
-            html_output = self.build_wcag_tiles_html(ratio, results_criteria)
-            self.result_label.setText(html_output)
+            if gradient is None:
+                font = self.preview_label.font()
+                rendered = rendered_glyph_contrast(
+                    self.preview_label.text(), font.family(), font.pointSize(), font.bold(), fg_hex, bg_hex
+                )
+                detail = None if rendered is None else f"Rendered glyphs: {rendered:.2f}"
+            else:
+                detail = f"Gradient worst case · area-weighted: {stats['weighted']:.2f}"
+
+            self.last_result = ("tiles", ratio, results_criteria, detail)
+            self.last_pair = (fg_hex, bg_hex)
+            self.render_result()
 
         except ValueError as e:
-            self.result_label.setText(self._styled_fail_card(f"Error: {str(e)}"))
-            self.last_ratio = None
-
-    def _styled_fail_card(self, msg):                #que los resultados seas un poco mejor visualmente
-        if self.is_dark_mode:
-            bg = "#333"
-            txt = "#eee"
-            fail_color = "salmon"
+            self.show_fail_result(f"Error: {str(e)}")
+
+    def show_fail_result(self, msg):
+        self.last_ratio = None
+        self.last_result = ("fail", msg)
+        self.render_result()
+
+    ############################################################################
+    # Report / html + pdf
+
+    def report_snapshot(self):           #copies of what is on screen now, the worker never touches the widgets
+        snapshot = {"created": time.strftime("%Y-%m-%d %H:%M")}
+        if self.last_result is not None and self.last_result[0] == "tiles" and self.last_pair is not None:
+            _, ratio, criteria, detail = self.last_result
+            snapshot["pair"] = (*self.last_pair, ratio, [dict(c) for c in criteria], detail)
+        snapshot["worksheet"] = self.pairs_model.audit_entries()
+        snapshot["palette"] = self.last_palette
+
+        heatmaps = []
+        if self.source_image is not None:
+            heatmap = ContrastHeatmap(self.heatmap.tile)                 # the live timer keeps updating the real one
+            heatmap.ratios = self.heatmap.ratios.copy()
+            heatmap.size = self.heatmap.size
+            heatmaps.append(("Current image", self.source_image, heatmap, self.image_info_label.text()))
+        for row in self.document_rows:
+            if row is not None:
+                summary = f"{row['width']}×{row['height']} · {row['tiles_below_aa']} of {row['tiles_with_content']} tiles with content below AA"
+                heatmaps.append((f"{row['file']} page {row['page']}", row["thumbnail"], None, summary))
+        snapshot["heatmaps"] = heatmaps
+        return snapshot
+
+    def save_report(self):
+        file_path, chosen = QFileDialog.getSaveFileName(
+            self, "Save Report", "contrast-report.html", "HTML (*.html);;PDF (*.pdf)"
+        )
+        if not file_path:
+            return
+        if chosen.startswith("PDF") and not file_path.lower().endswith(".pdf"):
+            file_path += ".pdf"
+        self.write_report_async(file_path)
+
+    def write_report_async(self, file_path):
+        snapshot = self.report_snapshot()
+        self.report_button.setEnabled(False)
+        self.report_button.setText("Saving…")
+        signals = self.report_signals
+
+        def run():
+            try:
+                write_report(snapshot, file_path)
+            except Exception as e:               # anything, or the button stays at "Saving…"
+                signals.finished.emit(file_path, str(e) or type(e).__name__)
+            else:
+                signals.finished.emit(file_path, "")
+        report_pool().start(run)
+
+    def on_report_finished(self, file_path, error):
+        self.report_button.setEnabled(True)
+        self.report_button.setText("Save Report…")
+        if error:
+            QMessageBox.warning(self, "Save Report", f"Could not write {file_path}:\n{error}")
         else:
-            bg = "#f4f4f4"
-            txt = "#333"
-            fail_color = "red"
-        return f"""
-        <div style="max-width:350px; background:{bg}; color:{txt};
-                    border-radius:8px; box-shadow:0 2px 5px rgba(0,0,0,0.15);
-                    font-family:Arial,sans-serif; padding:14px; margin:10px;">
-          <h3 style="margin:0 0 8px 0; font-size:1.1em;">
-            <span style="color:{fail_color}; margin-right:6px;">✖</span>
-            Fail
-          </h3>
-          <div>{msg}</div>
-        </div>
-        """
-
-    def build_wcag_tiles_html(self, ratio, criteria_list):           #again making sure it loks goods 
-        if self.is_dark_mode:
-            grid_bg = "#333"
-            tile_bg = "#444"
-            text_color = "#eee"
-            pass_color = "lime"
-            fail_color = "salmon"
+            self.report_button.setToolTip(f"Last saved: {file_path}")
+
+    def render_result(self):             #pushes the last result into the card, only the labels that changed get touched
+        if self.last_result is None:
+            return
+        if self.last_result[0] == "fail":
+            self.result_card.show_fail(self.last_result[1])
         else:
-            grid_bg = "#f9f9f9"
-            tile_bg = "#fff"
-            text_color = "#333"
-            pass_color = "#2e7d32"
-            fail_color = "#d32f2f"
-
-        html = f"""
-        <div style="
-          max-width:600px; 
-          background:{grid_bg};
-          border-radius:8px;
-          box-shadow:0 2px 5px rgba(0,0,0,0.15);
-          font-family:Arial,sans-serif;
-          color:{text_color};
-          padding:16px;
-          margin:10px;">
-          
-          <h3 style="margin-top:0; margin-bottom:14px; font-size:1.2em;">
-            WCAG Criteria – Contrast ratio: {ratio:.2f}
-          </h3>
-
-          <div style="
-            display:flex;
-            flex-wrap:wrap;
-            gap:10px;">
-        """
-
-        def passfail_html(label, status):         #yes or no icons
-            if status.lower() == "pass":
-                icon = "✔"
-                color = pass_color
-            elif status.lower() == "fail":
-                icon = "✖"
-                color = fail_color
-            else:
-                icon = "?"
-                color = text_color
-            return f"""
-            <div style="margin:3px 0; display:flex; align-items:center;">
-              <span style="color:{color}; margin-right:6px;">{icon}</span>
-              <span>{label}: {status}</span>
-            </div>
-            """
-
-        for crit in criteria_list:
-            ctitle = crit.get("title", "Criterion")
-            reg_status = crit.get("regular", "N/A")
-            larg_status = crit.get("large", "N/A")
-
-            html += f"""
-            <div style="
-              background:{tile_bg};
-              border-radius:6px;
-              box-shadow:0 1px 3px rgba(0,0,0,0.2);
-              padding:12px;
-              min-width:160px;">
-              <h4 style="margin-top:0; margin-bottom:8px; font-size:1em;">
-                {ctitle}
-              </h4>
-              {passfail_html("Regular Text", reg_status)}
-              {passfail_html("Large Text", larg_status)}
-            </div>
-            """
-
-        html += """
-          </div> <!-- end .flex-wrap -->
-        </div> <!-- end outer card -->
-        """
-        return html
+            _, ratio, criteria, detail = self.last_result
+            self.result_card.show_result(ratio, criteria, detail)
 
 
 #########################################################################################
 # Main
 
 if __name__ == "__main__":                  #making sure it converst into a window or app with 900 x 500 size
+    multiprocessing.freeze_support()           # the palette pool needs this in the packaged exe
     app = QApplication(sys.argv)
+    app.setApplicationName("ColorContrast")       # also names the folder where the session is saved
     app.setStyle("Fusion")
     
-    app.setStyleSheet(LIGHT_STYLESHEET)        # Start in light mode by default
+    app.setStyleSheet(TOOLTIP_STYLESHEET)      # the theme stylesheet lives on the window, see apply_theme()
 
-    window = ContrastCheckerWidget()
+    window = ContrastCheckerWidget(SessionStore(default_session_path()))
     window.resize(900, 500)
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,30 @@
+import os
+import sys
+import time
+
+import pytest
+from hypothesis import HealthCheck, settings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))      # ColorContrast.py, also for a plain `pytest tests`
+
+# HYPOTHESIS_PROFILE=ci for the long run, the default stays quick enough for every commit
+settings.register_profile("dev", max_examples=100, deadline=None)
+settings.register_profile("ci", max_examples=500, deadline=None, database=None, suppress_health_check=[HealthCheck.too_slow])
+settings.load_profile(os.environ.get("HYPOTHESIS_PROFILE", "dev"))
+
+# FAST_PATH_SECONDS=60: every property test keeps running new rounds of examples until its share of the time is
+# used up, like the old --self-check did. max_examples alone can't promise a CI job how long it takes
+FAST_PATH_SECONDS = float(os.environ.get("FAST_PATH_SECONDS", "0"))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    test = pyfuncitem.obj
+    if FAST_PATH_SECONDS <= 0 or not getattr(test, "is_hypothesis_test", False):
+        return None                  # pytest runs it once as usual
+    kwargs = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    deadline = time.perf_counter() + FAST_PATH_SECONDS
+    test(**kwargs)                   # at least one round, each round draws new examples
+    while time.perf_counter() < deadline:
+        test(**kwargs)
+    return True
@@ -0,0 +1,156 @@
+"""Every fast path (caches, lookup tables, vectorized kernels) against the scalar formulas."""
+import colorsys
+import functools
+
+import numpy as np
+from hypothesis import given, strategies as st
+
+import ColorContrast as C
+
+HEX_DIGITS = "0123456789abcdefABCDEF"
+CONFORMANCE_EDGES = (3.0, 4.5, 7.0)
+
+
+def oracle_luminance(hex_color):     # the parsing contrast_ratio() does, then relative_luminance()
+    h = hex_color[:7]
+    return C.relative_luminance(int(h[1:3], 16) / 255.0, int(h[3:5], 16) / 255.0, int(h[5:7], 16) / 255.0)
+
+
+@functools.lru_cache(maxsize=None)
+def conformance_edge_pairs():        # (fg, bg) pairs right below and right above 3.0 / 4.5 / 7.0, found by scanning grays
+    rng = np.random.default_rng(0)
+    backgrounds = ["#FFFFFF", "#000000"] + ["#%02X%02X%02X" % tuple(c) for c in rng.integers(0, 256, (254, 3))]
+    grays = ["#%02X%02X%02X" % (v, v, v) for v in range(256)]
+    pairs = []
+    for bg in backgrounds:
+        ratios = [C.contrast_ratio(fg, bg) for fg in grays]
+        for edge in CONFORMANCE_EDGES:
+            for i in range(255):
+                if (ratios[i] >= edge) != (ratios[i + 1] >= edge):
+                    pairs.extend([(grays[i], bg), (grays[i + 1], bg)])
+    return tuple(pairs)
+
+
+hex_colors = st.one_of(
+    st.text(HEX_DIGITS, min_size=6, max_size=6), st.text(HEX_DIGITS, min_size=8, max_size=8)
+).map(lambda digits: "#" + digits)
+
+near_hex_text = st.tuples(
+    st.sampled_from(["", "#", "##"]), st.text(HEX_DIGITS, min_size=0, max_size=9), st.sampled_from(["", " ", "\t", "\n"])
+).map(lambda p: p[2] + p[0] + p[1] + p[2])
+
+seeds = st.integers(0, 2 ** 32 - 1)
+unit = st.floats(0.0, 1.0)
+
+
+def check_hex_pair(fg, bg):          # luminance cache, ratio, worksheet row, token audit
+    expected = C.contrast_ratio(fg, bg)
+    assert C.hex_luminance(fg) == oracle_luminance(fg)
+    assert C.ratio_from_luminance(C.hex_luminance(fg), C.hex_luminance(bg)) == expected
+    row = C.ContrastPairsModel.compute_row("pair", fg, bg)
+    assert row[C.ContrastPairsModel.ROW_RATIO] == expected
+    assert row[C.ContrastPairsModel.ROW_RATIO + 1] == C.check_conformance(expected)
+    tokens = C.TokenSet()
+    tokens.add("pair.text", fg)
+    tokens.add("pair.bg", bg)
+    tokens.pair_hints.append(("pair.text", "pair.bg"))
+    entries, errors = C.audit_token_pairs(tokens)
+    assert not errors
+    assert entries[0]["ratio"] == expected
+    assert entries[0]["results"] == C.check_conformance(expected)
+
+
+@given(hex_colors, hex_colors)
+def test_hex_pair(fg, bg):
+    check_hex_pair(fg, bg)
+
+
+@given(st.sampled_from(conformance_edge_pairs()))
+def test_conformance_edges(pair):
+    fg, bg = pair
+    check_hex_pair(fg, bg)
+    fast = C.ratio_from_luminance(C.hex_luminance(fg), C.hex_luminance(bg))
+    assert C.check_conformance(fast) == C.check_conformance(C.contrast_ratio(fg, bg))
+
+
+@given(st.one_of(near_hex_text, st.text(max_size=12)))
+def test_hex_text(text):             # what the inputs accept: 6/8 digits, any case, optional #, and "#abc" only as a css color
+    stripped = text.strip()
+    digits = stripped[1:] if stripped.startswith("#") else stripped
+    is_hex = bool(digits) and all(c in HEX_DIGITS for c in digits)
+    if is_hex and len(digits) in (6, 8):
+        norm = C.normalize_hex(text)
+        assert norm == "#" + digits.upper()
+        lower = "#" + digits.lower()
+        assert C.hex_luminance(norm) == C.hex_luminance(lower) == oracle_luminance(lower)
+        assert C.contrast_ratio(norm, "#FFFFFF") == C.contrast_ratio(lower, "#FFFFFF")
+        assert C.hex_to_rgba(norm) == C.hex_to_rgba(lower)
+        return
+    try:
+        C.normalize_hex(text)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(f"normalize_hex accepted {text!r}")
+    if is_hex and len(digits) in (3, 4) and stripped.startswith("#"):
+        long_hex = C.parse_css_color(stripped)
+        assert long_hex == "#" + "".join(ch * 2 for ch in digits).upper()
+        assert C.hex_luminance(long_hex) == oracle_luminance(long_hex)
+
+
+@given(seeds, st.integers(1, 2000))
+def test_u8_luminance(seed, count):  # LUT engines, compared pixel by pixel
+    rgb = np.random.default_rng(seed).integers(0, 256, (count, 3), dtype=np.uint8)
+    expected = np.array([C.relative_luminance(*(c / 255.0 for c in px)) for px in rgb.tolist()])
+    assert np.array_equal(C.relative_luminance_u8(rgb), expected)
+    assert np.array_equal(C.relative_luminance_u8_planes(rgb), expected)
+
+
+@given(st.lists(st.tuples(unit, unit, unit), min_size=1, max_size=64))
+def test_hsv_to_rgb_array(colors):   # the palette search kernel == colorsys, color by color
+    h, s, v = (np.array(channel) for channel in zip(*colors))
+    expected = np.array([colorsys.hsv_to_rgb(*color) for color in colors])
+    assert np.array_equal(C.hsv_to_rgb_array(h, s, v), expected)
+
+
+@given(hex_colors, hex_colors, st.sampled_from(C.GRADIENT_KINDS), st.sampled_from(range(0, 360, 45)))
+def test_solid_gradient(fg, bg, kind, angle):    # a one color gradient is just that background
+    fg, bg = fg[:7], bg[:7]
+    expected = C.contrast_ratio(fg, bg)
+    stats = C.gradient_contrast(fg, ((0.0, bg), (1.0, bg)), kind, angle)
+    assert stats["worst"] == stats["best"] == expected
+    assert abs(stats["weighted"] - expected) <= 1e-12 * expected
+    passes = C.check_conformance(expected)["AA (Normal Text)"] == "Pass"
+    assert stats["aa_area"] == (1.0 if passes else 0.0)
+
+
+@given(seeds, st.integers(1, 200), st.integers(1, 200), st.integers(0, 6))
+def test_heatmap_diff(seed, width, height, edits):      # incremental update == analyzing the frame from scratch
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    incremental = C.ContrastHeatmap()
+    incremental.update(frame)
+    for _ in range(edits):
+        frame = frame.copy()
+        x, y = rng.integers(0, width), rng.integers(0, height)
+        frame[y:y + rng.integers(1, 40), x:x + rng.integers(1, 40)] = rng.integers(0, 256, 3, dtype=np.uint8)
+        incremental.update(frame)
+    fresh = C.ContrastHeatmap()
+    fresh.update(frame)
+    assert np.array_equal(incremental.ratios, fresh.ratios)
+    tile_size = C.HEATMAP_TILE
+    ty, tx = fresh.ratios.shape
+    y, x = rng.integers(0, ty), rng.integers(0, tx)
+    tile = np.pad(frame, ((0, -height % tile_size), (0, -width % tile_size), (0, 0)), mode="edge")[
+        y * tile_size:(y + 1) * tile_size, x * tile_size:(x + 1) * tile_size]
+    lum = [C.relative_luminance(*(c / 255.0 for c in px)) for px in tile.reshape(-1, 3).tolist()]
+    assert fresh.ratios[y, x] == C.ratio_from_luminance(max(lum), min(lum))
+
+
+@given(st.sampled_from(list(C.PERCEPTUAL_SPACES)), st.integers(0, 360), st.integers(0, 100), st.integers(0, 100))
+def test_gamut_clip(space, hue, chroma, light):          # the table lookup never lets a slider leave sRGB
+    info = C.PERCEPTUAL_SPACES[space]
+    clipped = min(chroma / 100.0 * info["c_max"], C.max_chroma_table(space)[light, hue % 360])
+    lin = info["to_linear"](C.lch_to_lab(np.array([light / 100.0 * info["l_max"], clipped, float(hue)])))
+    assert np.all(lin >= -1e-6) and np.all(lin <= 1.0 + 1e-6)
+    assert C._HEX_RE.match(C.perceptual_sliders_to_hex(space, hue, chroma, light))
@@ -0,0 +1,59 @@
+"""The stored session survives a slow start: nothing is saved before it is applied."""
+import os
+import sqlite3
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QApplication
+
+import ColorContrast as C
+
+app = QApplication.instance() or QApplication([])
+
+
+def spin(seconds, until=lambda: False):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end and not until():
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def test_session_survives_a_late_first_paint(tmp_path):
+    path = str(tmp_path / "session.sqlite3")
+    store = C.SessionStore(path)
+    store.save_async({"fg": "#123456", "bg": "#FFFFFF"}, [QColor("#ABCDEF").rgb()])
+    store.close()
+
+    window = C.ContrastCheckerWidget(C.SessionStore(path))
+    spin(2 * window.save_timer.interval() / 1000.0)          # the save timer from __init__ runs out before the first paint
+    loaded = []
+    window.show()
+    spin(5.0, until=lambda: window.cold_start_ms is not None)
+    window.session_store.signals.loaded.connect(loaded.append)
+    spin(5.0, until=lambda: loaded)
+
+    assert window.fg_input.text() == "#123456"
+    assert [c.name() for c in window.custom_colors] == ["#abcdef"]
+    window.close()
+
+    db = sqlite3.connect(path)
+    assert dict(db.execute("SELECT key, value FROM settings"))["fg"] == "#123456"
+    assert [rgb for (rgb,) in db.execute("SELECT rgb FROM swatches")] == [QColor("#ABCDEF").rgb()]
+    db.close()
+
+
+def test_closing_before_the_session_loads_keeps_it(tmp_path):
+    path = str(tmp_path / "session.sqlite3")
+    store = C.SessionStore(path)
+    store.save_async({"fg": "#123456"}, [QColor("#ABCDEF").rgb()])
+    store.close()
+
+    window = C.ContrastCheckerWidget(C.SessionStore(path))
+    window.close()                   # never painted, so never loaded
+
+    db = sqlite3.connect(path)
+    assert dict(db.execute("SELECT key, value FROM settings"))["fg"] == "#123456"
+    assert db.execute("SELECT COUNT(*) FROM swatches").fetchone()[0] == 1
+    db.close()